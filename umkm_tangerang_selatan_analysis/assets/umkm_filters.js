@@ -0,0 +1,172 @@
+/*
+ * 📈 UMKM Dashboard - Clientside Filter Callbacks
+ * Recomputes the map, charts and cards in the browser from the compact
+ * (kecamatan x bidang x skala) cube shipped once in the "cube-store".
+ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    umkm: {
+        toggleHighlight: function (mapClick, chartClick, current) {
+            const triggered = dash_clientside.callback_context.triggered;
+            if (!triggered.length) {
+                return dash_clientside.no_update;
+            }
+
+            const click = triggered[0].prop_id.startsWith('geomap') ? mapClick : chartClick;
+            if (!click || !click.points || !click.points.length) {
+                return dash_clientside.no_update;
+            }
+
+            // Clicking the highlighted kecamatan again clears the highlight
+            const name = click.points[0].customdata;
+            if (name === undefined) {
+                return dash_clientside.no_update;
+            }
+            return name === current ? null : name;
+        },
+
+        updateFigures: function (kecamatan, bidang, skala, highlight, relayout, tiles, cube, geomap, districtChart, businessTypeChart) {
+            const triggered = dash_clientside.callback_context.triggered.map(t => t.prop_id);
+            const choropleth = geomap.data[0].type === 'choroplethmapbox';
+
+            // Zooming only matters when it moves the choropleth to another boundary level
+            let geojson = geomap.data[0].geojson;
+            const zoom = relayout ? relayout['mapbox.zoom'] : undefined;
+            if (choropleth && zoom !== undefined && cube.boundaries) {
+                // Levels are sorted by min_zoom: keep the last one the zoom reaches
+                geojson = cube.boundaries.reduce((url, level) => zoom >= level.min_zoom ? level.url : url,
+                    cube.boundaries[0].url);
+            }
+            if (triggered.every(id => id.startsWith('geomap.')) && geojson === geomap.data[0].geojson) {
+                return new Array(6).fill(dash_clientside.no_update);
+            }
+
+            const nKec = cube.kecamatan.length;
+            const nBid = cube.bidang.length;
+            const nSkala = cube.skala.length;
+
+            // Empty kecamatan/bidang selections mean all; an empty skala selection means none
+            const selected = (names, chosen) => names.map(name => !chosen || !chosen.length || chosen.includes(name));
+            const kecSel = selected(cube.kecamatan, kecamatan);
+            const bidSel = selected(cube.bidang, bidang);
+            const skalaSel = cube.skala.map(name => skala === null || skala === undefined || skala.includes(name));
+
+            const kecSums = Array.from({length: nKec}, () => new Array(nSkala).fill(0));
+            const bidSums = Array.from({length: nBid}, () => new Array(nSkala).fill(0));
+            const values = cube.values;
+            for (let k = 0; k < nKec; k++) {
+                if (!kecSel[k]) continue;
+                for (let b = 0; b < nBid; b++) {
+                    if (!bidSel[b]) continue;
+                    const offset = (k * nBid + b) * nSkala;
+                    for (let s = 0; s < nSkala; s++) {
+                        if (!skalaSel[s]) continue;
+                        kecSums[k][s] += values[offset + s];
+                        bidSums[b][s] += values[offset + s];
+                    }
+                }
+            }
+            const total = sums => sums.reduce((a, b) => a + b, 0);
+            const fmt = value => value.toLocaleString('en-US');
+            const mikro = cube.skala.indexOf('Mikro');
+            const kecil = cube.skala.indexOf('Kecil');
+            const hover = row => '<b>' + row.name + '</b><br>' +
+                'Total UMKM: ' + fmt(row.total) + '<br>' +
+                'Mikro: ' + fmt(row.sums[mikro]) + '<br>' +
+                'Kecil: ' + fmt(row.sums[kecil]);
+
+            // District chart: every selected kecamatan, zero totals included
+            const kecRows = [];
+            cube.kecamatan.forEach((name, k) => {
+                if (kecSel[k]) kecRows.push({name: name, sums: kecSums[k], total: total(kecSums[k])});
+            });
+            const highlightIndex = rows => {
+                const i = rows.findIndex(row => row.name === highlight);
+                return i >= 0 ? [i] : null;
+            };
+
+            const districtTrace = Object.assign({}, districtChart.data[0], {
+                x: kecRows.map(row => row.name),
+                y: kecRows.map(row => row.total),
+                customdata: kecRows.map(row => row.name),
+                marker: Object.assign({}, districtChart.data[0].marker, {color: kecRows.map(row => row.total)}),
+                selectedpoints: highlightIndex(kecRows),
+                unselected: {marker: {opacity: 0.35}}
+            });
+
+            // Map: districts with data, as polygons or as bubbles sized like geomap_builder
+            let mapTrace;
+            if (choropleth) {
+                const rows = kecRows.filter(row => row.total > 0);
+                mapTrace = Object.assign({}, geomap.data[0], {
+                    geojson: geojson,
+                    locations: rows.map(row => row.name),
+                    z: rows.map(row => row.total),
+                    zmax: Math.max(1, ...rows.map(row => row.total)),
+                    customdata: rows.map(row => row.name),
+                    text: rows.map(hover),
+                    selectedpoints: highlightIndex(rows),
+                    unselected: {marker: {opacity: 0.3}}
+                });
+            } else {
+                const m = cube.marker;
+                const kecIndex = {};
+                cube.kecamatan.forEach((name, k) => { kecIndex[name] = k; });
+                const points = cube.districts
+                    .map(d => Object.assign({}, d, {k: kecIndex[d.name]}))
+                    .filter(d => kecSel[d.k] && total(kecSums[d.k]) > 0)
+                    .map(d => Object.assign(d, {sums: kecSums[d.k], total: total(kecSums[d.k])}));
+                const maxTotal = Math.max(1, ...points.map(p => p.total));
+
+                mapTrace = Object.assign({}, geomap.data[0], {
+                    lon: points.map(p => p.lon),
+                    lat: points.map(p => p.lat),
+                    customdata: points.map(p => p.name),
+                    text: points.map(hover),
+                    marker: Object.assign({}, geomap.data[0].marker, {
+                        size: points.map(p => Math.min(m.size_max, Math.max(m.size_min, Math.sqrt(p.total) * m.size_scale))),
+                        color: points.map(p => p.total),
+                        cmax: maxTotal
+                    }),
+                    selectedpoints: highlightIndex(points),
+                    unselected: {marker: {opacity: 0.3}}
+                });
+            }
+
+            // Business density: cells of the viewport's tiles, fetched by the server callback
+            const mapData = [mapTrace];
+            if (geomap.data.length > 1) {
+                mapData.push(Object.assign({}, geomap.data[1], tiles ? {
+                    lon: tiles.lon,
+                    lat: tiles.lat,
+                    z: tiles.count,
+                    zmax: Math.max(1, tiles.max_count),
+                    radius: tiles.radius
+                } : {}));
+            }
+
+            // Bidang chart: bidang with data, largest first (stable on name order)
+            const bidRows = [];
+            cube.bidang.forEach((name, b) => {
+                const t = total(bidSums[b]);
+                if (bidSel[b] && t > 0) bidRows.push({name: name, total: t, order: b});
+            });
+            bidRows.sort((a, b) => (b.total - a.total) || (a.order - b.order));
+            const businessTypeTrace = Object.assign({}, businessTypeChart.data[0], {
+                labels: bidRows.map(row => row.name),
+                values: bidRows.map(row => row.total)
+            });
+
+            const skalaTotals = kecRows.reduce((acc, row) => acc.map((v, s) => v + row.sums[s]), new Array(nSkala).fill(0));
+
+            return [
+                {data: mapData, layout: geomap.layout},
+                {data: [districtTrace], layout: districtChart.layout},
+                {data: [businessTypeTrace], layout: businessTypeChart.layout},
+                fmt(total(skalaTotals)),
+                fmt(mikro >= 0 ? skalaTotals[mikro] : 0),
+                fmt(kecil >= 0 ? skalaTotals[kecil] : 0)
+            ];
+        }
+    }
+});
@@ -0,0 +1,203 @@
+"""
+⏱️ Benchmark Pipeline - Stage Timing at Synthetic Scale
+Times every pipeline stage on synthetic inputs from 10² to 10⁶ rows,
+records peak memory and writes a machine-readable results file
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from create_sample_data import SampleDataGenerator
+from umkm_data_processor import UMKMDataProcessor
+from dashboard_umkm_static import UMKMStaticDashboard
+from export_geomap import create_standalone_geomap
+from pipeline_metrics import PipelineMetrics
+
+DEFAULT_SCALES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+STAGES = [
+    'load_csv_files',
+    'load_csv_files_cached',
+    'process_data',
+    'create_analysis_views',
+    'save_excel_analysis',
+    'save_json_data',
+    'save_columnar_data',
+    'static_load_data',
+    'generate_html',
+    'create_standalone_geomap'
+]
+
+class StageTimer:
+    """Times stages through PipelineMetrics and keeps their output quiet"""
+
+    def __init__(self, scale, track_memory=True):
+        self.scale = scale
+        self.metrics = PipelineMetrics(track_memory=track_memory)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        # Pipeline stages are chatty; keep the benchmark output readable
+        with self.metrics.stage(name) as record, contextlib.redirect_stdout(io.StringIO()):
+            yield
+        memory = '' if record['peak_mb'] is None else f", puncak {record['peak_mb']:,.1f} MB"
+        print(f"   {name:<26} {record['seconds']:>9.3f} dtk{memory}")
+
+    @property
+    def results(self):
+        return [
+            {'scale': self.scale, 'stage': r['stage'], 'seconds': r['seconds'], 'peak_mb': r['peak_mb']}
+            for r in self.metrics.stages
+        ]
+
+def run_scale(scale, workdir, stages, track_memory=True, excel_streaming=False, workers=None):
+    """Run the selected stages for one synthetic scale"""
+    data_dir = workdir / 'data'
+    output_dir = workdir / 'data_output'
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        SampleDataGenerator(data_folder=data_dir).create_scaled_data(scale)
+
+    timer = StageTimer(scale, track_memory=track_memory)
+    json_path = output_dir / 'umkm_data.json'
+
+    processor = UMKMDataProcessor(data_folder=data_dir, output_folder=output_dir)
+    with timer.stage('load_csv_files'):
+        processor.load_csv_files(workers=workers)
+
+    if 'load_csv_files_cached' in stages:
+        cached = UMKMDataProcessor(data_folder=data_dir, output_folder=output_dir)
+        with timer.stage('load_csv_files_cached'):
+            cached.load_csv_files(workers=workers)
+
+    with timer.stage('process_data'):
+        processor.process_data()
+    with timer.stage('create_analysis_views'):
+        processor.create_analysis_views()
+
+    if 'save_excel_analysis' in stages:
+        with timer.stage('save_excel_analysis'):
+            processor.save_excel_analysis(streaming=excel_streaming)
+    with timer.stage('save_json_data'):
+        processor.save_json_data()
+    if 'save_columnar_data' in stages:
+        with timer.stage('save_columnar_data'):
+            processor.save_columnar_data()
+
+    if 'static_load_data' in stages or 'generate_html' in stages:
+        with timer.stage('static_load_data'):
+            dashboard = UMKMStaticDashboard(data_path=json_path)
+        if 'generate_html' in stages:
+            with timer.stage('generate_html'):
+                dashboard.generate_html(str(workdir / 'index.html'))
+
+    if 'create_standalone_geomap' in stages:
+        with timer.stage('create_standalone_geomap'):
+            create_standalone_geomap(data_path=json_path, output_path=str(workdir / 'geomap.html'))
+
+    timer.metrics.close()
+    return [result for result in timer.results if result['stage'] in stages]
+
+def compare_results(current, baseline, threshold=1.2):
+    """Print per-stage ratios against a baseline run; return regressions"""
+    previous = {(r['scale'], r['stage']): r for r in baseline['results']}
+    regressions = []
+
+    print("\n📊 PERBANDINGAN DENGAN BASELINE")
+    print("=" * 70)
+    print(f"{'scale':>9}  {'stage':<26} {'baseline':>10} {'sekarang':>10} {'rasio':>7}")
+    for result in current['results']:
+        before = previous.get((result['scale'], result['stage']))
+        if before is None or not before['seconds']:
+            continue
+        ratio = result['seconds'] / before['seconds']
+        flag = '  ⚠️' if ratio > threshold else ''
+        print(f"{result['scale']:>9,}  {result['stage']:<26} {before['seconds']:>10.3f} "
+              f"{result['seconds']:>10.3f} {ratio:>6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append((result['scale'], result['stage'], ratio))
+
+    return regressions
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark pipeline UMKM pada data sintetis')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='jumlah baris sintetis yang diuji (default: 10^2 .. 10^6)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES,
+                        help='stage yang diukur (default: semua)')
+    parser.add_argument('--output', default='data_output/benchmark_results.json',
+                        help='file hasil JSON')
+    parser.add_argument('--compare', help='file hasil sebelumnya sebagai baseline')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='rasio waktu yang dianggap regresi (default: 1.2)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='keluar dengan kode 1 bila ada regresi')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='matikan tracemalloc (waktu lebih akurat, tanpa puncak memori)')
+    parser.add_argument('--excel-streaming', action='store_true',
+                        help='gunakan save_excel_analysis(streaming=True)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='jumlah worker untuk load_csv_files')
+    parser.add_argument('--keep', action='store_true', help='jangan hapus folder kerja')
+    args = parser.parse_args(argv)
+
+    print("\n⏱️  BENCHMARK PIPELINE UMKM")
+    print("=" * 50)
+
+    results = []
+    for scale in args.scales:
+        workdir = Path(tempfile.mkdtemp(prefix=f'umkm_bench_{scale}_'))
+        print(f"\n🔢 {scale:,} baris ({workdir})")
+        try:
+            results.extend(run_scale(
+                scale,
+                workdir,
+                set(args.stages),
+                track_memory=not args.no_memory,
+                excel_streaming=args.excel_streaming,
+                workers=args.workers
+            ))
+        finally:
+            if not args.keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'track_memory': not args.no_memory,
+            'excel_streaming': args.excel_streaming,
+            'workers': args.workers
+        },
+        'results': results
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil benchmark disimpan: '{output_path}'")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} stage lebih lambat dari {args.threshold:.2f}x baseline")
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
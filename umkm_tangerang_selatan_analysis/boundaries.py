@@ -0,0 +1,163 @@
+"""
+🧭 Boundaries - Multi-resolution Administrative Polygons
+Simplifies kecamatan (and later kelurahan) boundary polygons at several
+tolerances once per source file, so maps can load the resolution that suits
+the current zoom instead of megabytes of full-resolution geometry
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping, shape
+
+from content_hash import write_asset
+
+# Full-resolution polygons, one feature per area with properties.name
+BOUNDARIES_PATH = 'data/tangsel_kecamatan_boundaries.geojson'
+OUTPUT_DIR = 'data_output/boundaries'
+INDEX_NAME = 'index.json'
+
+# (level, tolerance in degrees, lowest zoom it is used from). A tolerance of
+# about one screen pixel at the next level's zoom keeps the simplification
+# invisible: at zoom z one pixel is roughly 1.4 / 2**z degrees.
+LEVELS = (
+    ('low', 0.0007, 0),
+    ('medium', 0.00018, 12),
+    ('high', 0.00004, 14)
+)
+
+# Coordinates are rounded to ~10 cm, far below the finest tolerance
+COORDINATE_DECIMALS = 6
+
+def source_digest(path):
+    """sha256 hex digest of the boundary source file"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def read_boundaries(path):
+    """Validated (names, polygons) from a GeoJSON FeatureCollection
+
+    Every feature needs a properties.name and a Polygon or MultiPolygon
+    geometry; invalid rings are repaired with make_valid.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+
+    names, geometries = [], []
+    for i, feature in enumerate(collection.get('features', [])):
+        name = (feature.get('properties') or {}).get('name')
+        geometry = feature.get('geometry') or {}
+        if not name:
+            raise ValueError(f"feature {i} di '{path}' tidak punya properties.name")
+        if geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+            raise ValueError(f"feature '{name}' di '{path}' bukan Polygon/MultiPolygon ({geometry.get('type')})")
+        names.append(name)
+        geometries.append(shape(geometry))
+
+    if not names:
+        raise ValueError(f"'{path}' tidak berisi feature")
+
+    polygons = np.array(geometries, dtype=object)
+    invalid = ~shapely.is_valid(polygons)
+    if invalid.any():
+        polygons[invalid] = shapely.make_valid(polygons[invalid])
+    return names, polygons
+
+def simplified_collection(names, polygons, tolerance):
+    """FeatureCollection of ``polygons`` simplified to ``tolerance`` degrees"""
+    simplified = shapely.simplify(polygons, tolerance, preserve_topology=True)
+    simplified = shapely.transform(simplified, lambda coords: np.round(coords, COORDINATE_DECIMALS))
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {'type': 'Feature', 'id': name, 'properties': {'name': name}, 'geometry': mapping(geometry)}
+            for name, geometry in zip(names, simplified)
+        ]
+    }
+
+def load_boundary_index(output_dir=OUTPUT_DIR, layer='kecamatan'):
+    """Index of the simplified levels written for ``layer``, or None"""
+    try:
+        with open(Path(output_dir) / INDEX_NAME, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    entry = index.get(layer)
+    if not entry or not all((Path(output_dir) / level['file']).exists() for level in entry['levels']):
+        return None
+    return entry
+
+def level_for_zoom(levels, zoom):
+    """Level entry to draw at ``zoom`` (levels sorted by min_zoom)"""
+    chosen = levels[0]
+    for level in levels:
+        if zoom is not None and zoom >= level['min_zoom']:
+            chosen = level
+    return chosen
+
+def build_boundaries(source=BOUNDARIES_PATH, output_dir=OUTPUT_DIR, layer='kecamatan', levels=LEVELS, force=False):
+    """Write ``<layer>-<level>-<hash>.geojson`` per level and return the index entry
+
+    Skipped when the index already records this source file and these
+    levels. File names carry a content hash, so the dashboard can serve them
+    with a long cache lifetime; level files of ``layer`` that the new index
+    no longer lists are deleted.
+    """
+    output_dir = Path(output_dir)
+    digest = source_digest(source)
+    spec = [list(level) for level in levels]
+
+    index_path = output_dir / INDEX_NAME
+    try:
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        index = {}
+
+    current = load_boundary_index(output_dir, layer)
+    if not force and current and current['source_sha256'] == digest and current['spec'] == spec:
+        print(f"✅ Batas {layer} sudah terbaru ({len(current['levels'])} level)")
+        return current
+
+    names, polygons = read_boundaries(source)
+    source_size = Path(source).stat().st_size
+    print(f"🧭 Menyederhanakan {len(names)} batas {layer} ({source_size / 1024:,.0f} KB)")
+
+    entry = {'source_sha256': digest, 'spec': spec, 'names': names, 'levels': []}
+    for level, tolerance, min_zoom in levels:
+        content = json.dumps(
+            simplified_collection(names, polygons, tolerance), ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        file_name = write_asset(output_dir, f"{layer}-{level}-", content, suffix='.geojson', subdir='')
+        entry['levels'].append({'level': level, 'tolerance': tolerance, 'min_zoom': min_zoom, 'file': file_name})
+        print(f"   ✅ {level:<7} toleransi {tolerance:g}° -> {file_name} ({len(content) / 1024:,.0f} KB)")
+
+    index[layer] = entry
+    tmp_path = index_path.with_name(f"{INDEX_NAME}.tmp")
+    tmp_path.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding='utf-8')
+    tmp_path.replace(index_path)
+
+    # Drop superseded levels of this layer only after the new index is in place
+    current_files = {level['file'] for level in entry['levels']}
+    for path in output_dir.glob(f"{layer}-*.geojson"):
+        if path.name not in current_files:
+            path.unlink(missing_ok=True)
+    return entry
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Sederhanakan poligon batas wilayah untuk peta choropleth')
+    parser.add_argument('--source', default=BOUNDARIES_PATH, help='GeoJSON poligon resolusi penuh')
+    parser.add_argument('--output', default=OUTPUT_DIR, help='folder output')
+    parser.add_argument('--layer', default='kecamatan', help='nama lapisan (kecamatan, kelurahan)')
+    parser.add_argument('--force', action='store_true', help='bangun ulang walau sumber tidak berubah')
+    args = parser.parse_args(argv)
+
+    build_boundaries(args.source, args.output, layer=args.layer, force=args.force)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+🔖 Content Hash - Content-addressed Asset Files
+Writes files whose names carry a hash of their content, so pages and maps can
+serve them with a long cache lifetime
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+def write_asset(output_dir, stem, content, suffix='.js', subdir='assets'):
+    """Write ``content`` as ``<subdir>/<stem><hash><suffix>`` under ``output_dir``
+
+    The content hash in the file name lets the page be cached forever and
+    changes whenever the content does. Files of earlier content are not
+    touched: callers own the cleanup, as only they know which versions are
+    still referenced (boundaries.build_boundaries prunes superseded levels;
+    static pages keep theirs for other pages in the folder). Returns the path
+    relative to ``output_dir`` (POSIX style, usable as a script src).
+    """
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    file_name = f"{stem}{digest}{suffix}"
+
+    assets_dir = Path(output_dir) / subdir
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    target = assets_dir / file_name
+
+    if not target.exists():
+        tmp_path = target.with_name(f"{file_name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, target)
+
+    return f"{subdir}/{file_name}" if subdir else file_name
@@ -95,6 +95,49 @@ class SampleDataGenerator:
         
         return created_files
     
+    def create_scaled_data(self, n_rows, seed=42):
+        """Create synthetic CSV files with exactly ``n_rows`` kecamatan rows in total
+        
+        Used by the benchmark suite. Rows are spread over roughly
+        sqrt(n_rows) districts and as many sectors; beyond the real
+        kecamatan and bidang names, synthetic ones are generated.
+        """
+        rng = np.random.default_rng(seed)
+        
+        n_kecamatan = max(len(self.kecamatan_list), int(np.ceil(np.sqrt(n_rows))))
+        n_bidang = int(np.ceil(n_rows / n_kecamatan))
+        
+        kecamatan = self.kecamatan_list + [
+            f"Wilayah {i:05d}" for i in range(len(self.kecamatan_list), n_kecamatan)
+        ]
+        bidang = list(self.bidang_weights) + [
+            f"Bidang {i:05d}" for i in range(len(self.bidang_weights), n_bidang)
+        ]
+        
+        created_files = []
+        remaining = n_rows
+        for nama_bidang in bidang[:n_bidang]:
+            n = min(n_kecamatan, remaining)
+            remaining -= n
+            
+            total = rng.integers(5, 500, size=n)
+            micro = (total * rng.uniform(0.6, 0.9, size=n)).astype(int)
+            df = pd.DataFrame({
+                'Kecamatan': kecamatan[:n],
+                'Mikro': micro,
+                'Kecil': total - micro
+            })
+            
+            filepath = self.data_folder / f"{nama_bidang}.csv"
+            with open(filepath, 'w', encoding='utf-8-sig') as f:
+                f.write(f"DATA UMKM {nama_bidang.upper()} - TANGERANG SELATAN\n")
+                f.write(f"Tanggal: {datetime.now().strftime('%Y-%m-%d')}\n")
+                df.to_csv(f, sep=';', index=False)
+            created_files.append(filepath)
+        
+        print(f"✅ {n_rows:,} baris sintetis dalam {len(created_files)} file ({self.data_folder})")
+        return created_files
+    
     def create_summary(self):
         """Create a summary of the generated sample data"""
         all_data = []
@@ -4,21 +4,147 @@ Visualizes UMKM data with interactive charts and maps
 """
 
 import json
+import functools
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import dash
+import plotly
 from dash import Dash
 from dash import html
 from dash import dcc
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
+from flask import g, has_request_context, request, send_from_directory
 from pathlib import Path
+from umkm_payload import parse_payload
+from figure_cache import get_figure_cache
+from boundaries import INDEX_NAME as BOUNDARY_INDEX_NAME, level_for_zoom, load_boundary_index
+from geo_loader import load_districts
+from geomap_builder import (BUILDER_REVISION, MAP_CENTER, MAP_ZOOM, choropleth_trace_spec, create_geomap_figure,
+                            density_trace_spec, district_trace_spec, geomap_layout)
+from tile_pyramid import INDEX_NAME as TILE_INDEX_NAME, load_tile_index, viewport_bounds, viewport_cells
+from umkm_data_processor import UMKMCube
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+SKALA_OPTIONS = list(UMKMCube.SKALA)
+
+# Marker sizing shared with the browser-side filter callback
+MAP_MARKER = dict(size_min=15, size_max=50, size_scale=2)
+
+# Simplified boundary files are content-hashed, so browsers may keep them
+BOUNDARY_MAX_AGE = 365 * 24 * 3600
+
+# flask-compress appends the encoding to ETags it sends ("abc:br")
+COMPRESSED_ETAG_SUFFIX = re.compile(r':(?:br|gzip|deflate|zstd)"')
+
+# Part of the layout ETag: a new dashboard or library version changes the
+# layout even when the data file does not
+LAYOUT_REVISION = hashlib.sha256(
+    b''.join(Path(__file__).with_name(name).read_bytes() for name in ('dashboard_umkm.py', 'geomap_builder.py'))
+    + f"{dash.__version__}:{plotly.__version__}".encode()
+).hexdigest()
+
+def snapshot_files(data_path):
+    """Data file plus the boundary and tile manifests written next to it"""
+    data_path = Path(data_path)
+    return (data_path, data_path.parent / 'boundaries' / BOUNDARY_INDEX_NAME,
+            data_path.parent / 'tiles' / TILE_INDEX_NAME)
+
+def files_signature(paths):
+    """(size, mtime_ns) per file, None for a missing one"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+class DashboardSnapshot:
+    """Immutable set of data and derived DataFrames served by one layout"""
+    
+    def __init__(self, data_path):
+        self.data_path = Path(data_path)
+        stat = self.data_path.stat()
+        self.signature = files_signature(snapshot_files(self.data_path))
+        
+        with open(self.data_path, 'rb') as f:
+            raw = f.read()
+        self.data = parse_payload(raw)
+        
+        # The boundary and tile manifests are part of the version, so a run
+        # that only rebuilds them still reloads the dashboard
+        version = hashlib.sha256(raw)
+        for path in snapshot_files(self.data_path)[1:]:
+            try:
+                version.update(path.read_bytes())
+            except OSError:
+                pass
+            version.update(b'\0')
+        self.version = version.hexdigest()
+        
+        # Kecamatan polygons from boundaries.py, rebuilt with the data by run_all
+        self.boundaries = load_boundary_index(self.data_path.parent / 'boundaries')
+        
+        # Business-density tile pyramid from tile_pyramid.py
+        self.tiles = load_tile_index(self.data_path.parent / 'tiles')
+        
+        # HTTP validators for the layout built from this snapshot
+        self.etag = hashlib.sha256(
+            f"{LAYOUT_REVISION}:{self.version}".encode()
+        ).hexdigest()
+        self.last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(microsecond=0)
+        
+        # Convert to DataFrames for easier manipulation
+        self.df = pd.DataFrame(self.data['data_lengkap'])
+        self.df_kecamatan = pd.DataFrame(self.data['ringkasan_kecamatan'])
+        self.df_bidang = pd.DataFrame(self.data['ringkasan_bidang'])
+        
+        # Filters are answered from this cube (server-side for the initial
+        # figures, in the browser via the cube store), never from self.df
+        self.cube = UMKMCube.from_frame(self.df)
+        self.filter_views = functools.lru_cache(maxsize=256)(self._filter_views)
+        
+        # Filled in by UMKMDashboard.serve_layout on first use
+        self.layout = None
+    
+    def _filter_views(self, kecamatan=(), bidang=(), skala=None):
+        """Per-kecamatan and per-bidang summaries for one filter selection
+        
+        Arguments are tuples so results can be memoized; empty kecamatan or
+        bidang means all, ``skala=None`` means all size classes.
+        """
+        cube = self.cube.subset(kecamatan, bidang, skala)
+        df_kecamatan = cube.summary(0)
+        df_kecamatan.insert(0, 'Kecamatan', cube.kecamatan.to_numpy())
+        df_bidang = cube.summary(1)
+        df_bidang.insert(0, 'Bidang', cube.bidang.to_numpy())
+        df_bidang = df_bidang[df_bidang['Total'] > 0].sort_values('Total', ascending=False, kind='stable')
+        return df_kecamatan, df_bidang
 
 class UMKMDashboard:
-    def __init__(self, data_path='data_output/umkm_data.json'):
+    def __init__(self, data_path='data_output/umkm_data.json', reload_interval=5.0, compress=True):
         """Initialize dashboard with data"""
         self.data_path = Path(data_path)
+        self.reload_interval = reload_interval
+        self.figure_cache = get_figure_cache(self.data_path.parent / '.figure_cache')
+        self._local = threading.local()
+        self._watcher = None
+        self._stop_watcher = threading.Event()
+        self.districts = load_districts()
         self.load_data()
         
         # Initialize Dash app
@@ -26,19 +152,85 @@ class UMKMDashboard:
                        external_stylesheets=[dbc.themes.BOOTSTRAP],
                        title='Dashboard UMKM Tangsel')
         
+        # Flask instance for WSGI servers (see wsgi.py)
+        self.server = self.app.server
+        
+        # Served under /boundaries/ (see boundaries.py); without them the map shows bubbles
+        self.boundaries_dir = self.data_path.parent / 'boundaries'
+        self.tiles_dir = self.data_path.parent / 'tiles'
+        
         self.setup_layout()
         self.setup_callbacks()
+        self.setup_http(compress=compress)
     
     def load_data(self):
-        """Load data from JSON file"""
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
-            
-        # Convert to DataFrames for easier manipulation
-        self.df = pd.DataFrame(self.data['data_lengkap'])
-        self.df_kecamatan = pd.DataFrame(self.data['ringkasan_kecamatan'])
-        self.df_bidang = pd.DataFrame(self.data['ringkasan_bidang'])
+        """Load data from umkm_data.json or its columnar (gzipped) variant
         
+        The new snapshot is fully built before it replaces the current one
+        with a single reference assignment, so readers never see a mix.
+        """
+        self._snapshot = DashboardSnapshot(self.data_path)
+    
+    @property
+    def snapshot(self):
+        """Snapshot pinned for the current layout build, else the latest one"""
+        return getattr(self._local, 'snapshot', None) or self._snapshot
+    
+    @property
+    def data(self):
+        return self.snapshot.data
+    
+    @property
+    def df(self):
+        return self.snapshot.df
+    
+    @property
+    def df_kecamatan(self):
+        return self.snapshot.df_kecamatan
+    
+    @property
+    def df_bidang(self):
+        return self.snapshot.df_bidang
+    
+    @property
+    def boundaries(self):
+        return self.snapshot.boundaries
+    
+    @property
+    def tiles(self):
+        return self.snapshot.tiles
+    
+    def start_data_watcher(self):
+        """Poll the data file and the boundary/tile manifests in the background and hot-swap new data"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watcher.clear()
+        self._watcher = threading.Thread(target=self._watch_data, name='umkm-data-watcher', daemon=True)
+        self._watcher.start()
+    
+    def stop_data_watcher(self):
+        """Stop the background data watcher"""
+        self._stop_watcher.set()
+    
+    def _watch_data(self):
+        while not self._stop_watcher.wait(self.reload_interval):
+            signature = files_signature(snapshot_files(self.data_path))
+            if signature[0] is None or signature == self._snapshot.signature:
+                continue
+            
+            try:
+                snapshot = DashboardSnapshot(self.data_path)
+            except (OSError, EOFError, ValueError, KeyError) as e:
+                # Most likely caught mid-write; keep serving the old data and retry
+                print(f"⚠️  Gagal memuat ulang data ({e}), mencoba lagi nanti")
+                continue
+            
+            if snapshot.version != self._snapshot.version:
+                self._snapshot = snapshot
+                print(f"🔄 Data dashboard dimuat ulang: {snapshot.data['metadata']['last_updated']}")
+            else:
+                self._snapshot.signature = snapshot.signature
+    
     def create_overview_cards(self):
         """Create overview statistics cards"""
         stats = self.data['statistik']
@@ -47,105 +239,231 @@ class UMKMDashboard:
             dbc.Card([
                 dbc.CardBody([
                     html.H4("Total UMKM", className="card-title"),
-                    html.H2(f"{stats['total_umkm']:,}", className="card-text text-primary")
+                    html.H2(f"{stats['total_umkm']:,}", id="card-total", className="card-text text-primary")
                 ])
             ], className="mb-4"),
             
             dbc.Card([
                 dbc.CardBody([
                     html.H4("UMKM Mikro", className="card-title"),
-                    html.H2(f"{stats['total_mikro']:,}", className="card-text text-success")
+                    html.H2(f"{stats['total_mikro']:,}", id="card-mikro", className="card-text text-success")
                 ])
             ], className="mb-4"),
             
             dbc.Card([
                 dbc.CardBody([
                     html.H4("UMKM Kecil", className="card-title"),
-                    html.H2(f"{stats['total_kecil']:,}", className="card-text text-info")
+                    html.H2(f"{stats['total_kecil']:,}", id="card-kecil", className="card-text text-info")
                 ])
             ], className="mb-4")
         ]
         
         return dbc.Row([dbc.Col(card, width=4) for card in cards])
     
+    def create_filters(self):
+        """Create kecamatan, bidang and skala selectors"""
+        cube = self.snapshot.cube
+        return dbc.Row([
+            dbc.Col([
+                html.Label("Kecamatan"),
+                dcc.Dropdown(id="filter-kecamatan", options=list(cube.kecamatan), multi=True,
+                             placeholder="Semua kecamatan")
+            ], width=5),
+            dbc.Col([
+                html.Label("Bidang Usaha"),
+                dcc.Dropdown(id="filter-bidang", options=list(cube.bidang), multi=True,
+                             placeholder="Semua bidang usaha")
+            ], width=5),
+            dbc.Col([
+                html.Label("Skala"),
+                dcc.Checklist(id="filter-skala", options=SKALA_OPTIONS, value=SKALA_OPTIONS,
+                              inline=True, inputClassName="me-1", labelClassName="me-3")
+            ], width=2)
+        ], className="mb-4")
+    
+    def boundary_levels(self):
+        """Simplified boundary levels as {min_zoom, url}, or None without polygons"""
+        if self.boundaries is None:
+            return None
+        prefix = self.app.config.requests_pathname_prefix
+        return [
+            {'min_zoom': level['min_zoom'], 'url': f"{prefix}boundaries/{level['file']}"}
+            for level in self.boundaries['levels']
+        ]
+    
+    def boundary_url(self, zoom=MAP_ZOOM):
+        """URL of the boundary level drawn at ``zoom``, or None"""
+        levels = self.boundary_levels()
+        return None if levels is None else level_for_zoom(levels, zoom)['url']
+    
+    def tile_cells(self, relayout=None):
+        """Density cells of the tiles in a map viewport, or None without tiles
+        
+        The viewport comes from the map's ``relayout`` data (its corner
+        coordinates, else centre and zoom); without it, the initial view.
+        """
+        tiles = self.tiles
+        if tiles is None:
+            return None
+        relayout = relayout or {}
+        zoom = relayout.get('mapbox.zoom', MAP_ZOOM)
+        corners = (relayout.get('mapbox._derived') or {}).get('coordinates')
+        if corners:
+            lons, lats = zip(*corners)
+            bounds = (min(lons), min(lats), max(lons), max(lats))
+        else:
+            bounds = viewport_bounds(relayout.get('mapbox.center', MAP_CENTER), zoom)
+        
+        cells = viewport_cells(self.tiles_dir, tiles, *bounds, zoom)
+        # Blur over about one and a half cells at the current zoom
+        cell_pixels = 256 / tiles['grid'] * 2 ** (zoom - cells['zoom'])
+        cells['radius'] = round(min(40, max(2, cell_pixels * 1.5)), 1)
+        return cells
+    
+    def density_trace(self):
+        """Density trace of the initial viewport, or None without tiles"""
+        cells = self.tile_cells()
+        return None if cells is None else density_trace_spec(cells, radius=cells['radius'])
     
     def create_geomap(self):
-        """Create geographic distribution map"""
-        # Load district coordinates from GeoJSON
-        try:
-            with open('umkm_tangerang_selatan_analysis/data/tangsel_districts.geojson', 'r') as f:
-                districts_data = json.load(f)
-        except:
-            # Fallback to hardcoded coordinates if file not found
-            districts_data = {
-                "features": [
-                    {"properties": {"name": "Serpong"}, "geometry": {"coordinates": [106.6647, -6.3197]}},
-                    {"properties": {"name": "Serpong Utara"}, "geometry": {"coordinates": [106.6747, -6.2997]}},
-                    {"properties": {"name": "Ciputat"}, "geometry": {"coordinates": [106.7147, -6.3297]}},
-                    {"properties": {"name": "Ciputat Timur"}, "geometry": {"coordinates": [106.7447, -6.3197]}},
-                    {"properties": {"name": "Pamulang"}, "geometry": {"coordinates": [106.7347, -6.3497]}},
-                    {"properties": {"name": "Pondok Aren"}, "geometry": {"coordinates": [106.7147, -6.2797]}},
-                    {"properties": {"name": "Setu"}, "geometry": {"coordinates": [106.6847, -6.3397]}}
-                ]
-            }
+        """Create geographic distribution map (served from the figure cache)"""
+        fig = self.figure_cache.get_or_build(
+            self.data_path, 'geomap', self.build_geomap_figure, version=self.snapshot.version,
+            depends=[BUILDER_REVISION, self.districts.digest],
+            boundaries=self.boundary_url(), tiles=self.tiles and self.tiles['source_sha256'], **MAP_MARKER
+        )
+        return dcc.Graph(id="geomap", figure=fig)
+    
+    def build_geomap_figure(self, boundaries=None, tiles=None, **marker):
+        """Build the geographic distribution figure
         
-        # Create the map figure
-        fig = go.Figure()
-
-        # Add district markers with UMKM data
-        for district in districts_data['features']:
-            district_name = district['properties']['name']
-            lon, lat = district['geometry']['coordinates']
-            
-            # Get UMKM data for this district
-            district_data = self.df_kecamatan[self.df_kecamatan['Kecamatan'] == district_name]
-            if not district_data.empty:
-                district_data = district_data.iloc[0]
-                
-                # Calculate marker size based on total UMKM (scale it appropriately)
-                marker_size = max(15, min(50, np.sqrt(district_data['Total']) * 2))
-                
-                # Create color based on UMKM density
-                color_intensity = district_data['Total'] / self.df_kecamatan['Total'].max()
-                color = f'rgba(255, {int(255 * (1 - color_intensity))}, 0, 0.8)'
-                
-                # Add marker for this district
-                fig.add_trace(go.Scattermapbox(
-                    lon=[lon],
-                    lat=[lat],
-                    mode='markers',
-                    marker=dict(
-                        size=marker_size,
-                        color=color,
-                        opacity=0.8
-                    ),
-                    text=f"<b>{district_name}</b><br>" +
-                         f"Total UMKM: {district_data['Total']:,}<br>" +
-                         f"Mikro: {district_data['Mikro']:,}<br>" +
-                         f"Kecil: {district_data['Kecil']:,}",
-                    name=district_name,
-                    hoverinfo='text',
-                    showlegend=False
-                ))
-
-        # Update layout with map styling
-        fig.update_layout(
-            mapbox=dict(
-                style='open-street-map',
-                center=dict(lon=106.7047, lat=-6.3097),
-                zoom=11
-            ),
-            title="Peta Distribusi UMKM Tangerang Selatan<br><sub>Ukuran dan warna marker menunjukkan jumlah UMKM per kecamatan</sub>",
-            showlegend=False,
-            margin=dict(l=0, r=0, t=60, b=0),
-            height=600
+        A choropleth of the ``boundaries`` URL when polygons are available,
+        otherwise one bubble per kecamatan. With a tile pyramid (``tiles`` is
+        its source hash) a density trace of the initial viewport is added.
+        ``marker`` sizes the bubbles (see geomap_builder.district_trace_spec).
+        """
+        fig = create_geomap_figure(self.df_kecamatan, self.districts, boundaries=boundaries,
+                                   density=self.density_trace() if tiles else None, **marker)
+        # Keep the user's zoom and pan when filters replace the figure
+        fig.update_layout(uirevision='umkm')
+        return fig
+    
+    def create_data_store(self):
+        """Compact cube and district locations, shipped to the browser once
+        
+        assets/umkm_filters.js answers every filter and highlight interaction
+        from this store, so the server only handles page loads.
+        """
+        cube = self.snapshot.cube
+        points = self.districts.points()
+        points = points[points['Kecamatan'].isin(cube.kecamatan)]
+        
+        return dcc.Store(id="cube-store", data={
+            'kecamatan': cube.kecamatan.tolist(),
+            'bidang': cube.bidang.tolist(),
+            'skala': list(cube.SKALA),
+            'values': cube.values.ravel().tolist(),
+            'districts': [
+                {'name': name, 'lon': lon, 'lat': lat}
+                for name, lon, lat in points.itertuples(index=False, name=None)
+            ],
+            'marker': MAP_MARKER,
+            'boundaries': self.boundary_levels()
+        })
+    
+    def filtered_figures(self, kecamatan=None, bidang=None, skala=None):
+        """Map, district chart, bidang chart and card values for one selection
+        
+        Empty kecamatan/bidang selections mean all; an empty skala selection
+        means none (the checklist starts with every size class ticked).
+        Served from the snapshot's cube and returned as plain figure dicts.
+        Used for the figures of a page load; later interactions are computed
+        in the browser by assets/umkm_filters.js with the same rules.
+        """
+        snapshot = self.snapshot
+        df_kecamatan, df_bidang = snapshot.filter_views(
+            tuple(sorted(kecamatan or ())),
+            tuple(sorted(bidang or ())),
+            None if skala is None else tuple(sorted(skala))
         )
         
-        return dcc.Graph(figure=fig)
+        with_data = df_kecamatan[df_kecamatan['Total'] > 0]
+        boundaries = self.boundary_url()
+        geomap = {
+            'data': [
+                choropleth_trace_spec(with_data, boundaries) if boundaries is not None
+                else district_trace_spec(with_data, self.districts, **MAP_MARKER)
+            ],
+            'layout': dict(geomap_layout(), uirevision='umkm')
+        }
+        density = self.density_trace()
+        if density is not None:
+            geomap['data'].append(density)
+        
+        district_chart = {
+            'data': [{
+                'type': 'bar',
+                'x': df_kecamatan['Kecamatan'].to_numpy(),
+                'y': df_kecamatan['Total'].to_numpy(),
+                'customdata': df_kecamatan['Kecamatan'].to_numpy(),
+                'marker': {'color': df_kecamatan['Total'].to_numpy(), 'colorscale': 'Viridis'},
+                'hovertemplate': '<b>%{x}</b><br>Total UMKM: %{y:,}<extra></extra>'
+            }],
+            'layout': {
+                'title': 'Distribusi UMKM per Kecamatan',
+                'xaxis': {'title': 'Kecamatan'},
+                'yaxis': {'title': 'Jumlah UMKM'},
+                'height': 400,
+                'margin': dict(l=0, r=0, t=60, b=0)
+            }
+        }
+        
+        business_type_chart = {
+            'data': [{
+                'type': 'pie',
+                'labels': df_bidang['Bidang'].to_numpy(),
+                'values': df_bidang['Total'].to_numpy()
+            }],
+            'layout': {
+                'title': 'Distribusi UMKM berdasarkan Bidang Usaha',
+                'height': 400,
+                'margin': dict(l=0, r=0, t=60, b=0)
+            }
+        }
+        
+        totals = df_kecamatan[['Total', 'Mikro', 'Kecil']].sum()
+        cards = [f"{int(totals[column]):,}" for column in ('Total', 'Mikro', 'Kecil')]
+        
+        return geomap, district_chart, business_type_chart, *cards
     
     def setup_layout(self):
-        """Set up dashboard layout"""
-        self.app.layout = dbc.Container([
+        """Set up dashboard layout
+        
+        The layout is a function, so every page load is built from the latest
+        data snapshot without restarting the server.
+        """
+        self.app.layout = self.serve_layout
+    
+    def serve_layout(self):
+        """Layout for one page load, built once per snapshot
+        
+        The layout depends only on the data, so it is built from a pinned
+        snapshot on first use and reused until the data changes.
+        """
+        snapshot = self._request_snapshot()
+        if snapshot.layout is None:
+            self._local.snapshot = snapshot
+            try:
+                snapshot.layout = self.build_layout()
+            finally:
+                self._local.snapshot = None
+        return snapshot.layout
+    
+    def build_layout(self):
+        """Dashboard layout for the current snapshot"""
+        _, district_chart, business_type_chart, *_ = self.filtered_figures()
+        
+        return dbc.Container([
             # Header
             html.H1("Dashboard UMKM Tangerang Selatan", 
                    className="text-center my-4"),
@@ -153,6 +471,11 @@ class UMKMDashboard:
             # Overview Statistics
             self.create_overview_cards(),
             
+            # Filters, answered in the browser from the cube store
+            self.create_filters(),
+            self.create_data_store(),
+            dcc.Store(id="highlight-store"),
+            dcc.Store(id="tile-store"),
             
             # Geomap
             dbc.Row([
@@ -161,6 +484,16 @@ class UMKMDashboard:
                 ], width=12)
             ]),
             
+            # Charts
+            dbc.Row([
+                dbc.Col([
+                    dcc.Graph(id="district-chart", figure=district_chart)
+                ], width=6),
+                dbc.Col([
+                    dcc.Graph(id="business-type-chart", figure=business_type_chart)
+                ], width=6)
+            ], className="mt-4"),
+            
             # Footer
             html.Footer([
                 html.P(f"Last updated: {self.data['metadata']['last_updated']}",
@@ -170,18 +503,151 @@ class UMKMDashboard:
         ], fluid=True)
     
     def setup_callbacks(self):
-        """Set up interactive callbacks"""
+        """Set up interactive callbacks
+        
+        Highlights and filters run in the browser (assets/umkm_filters.js):
+        clicking a kecamatan on the map or district chart toggles a highlight,
+        and the filters recompute the figures from the cube store without a
+        request. Zooming the choropleth map swaps in the boundary level for
+        that zoom. Only panning or zooming a map with a tile pyramid asks the
+        server, for the density cells of the new viewport.
+        """
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='umkm', function_name='toggleHighlight'),
+            Output("highlight-store", "data"),
+            [Input("geomap", "clickData"),
+             Input("district-chart", "clickData")],
+            [State("highlight-store", "data")],
+            prevent_initial_call=True
+        )
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='umkm', function_name='updateFigures'),
+            [Output("geomap", "figure"),
+             Output("district-chart", "figure"),
+             Output("business-type-chart", "figure"),
+             Output("card-total", "children"),
+             Output("card-mikro", "children"),
+             Output("card-kecil", "children")],
+            [Input("filter-kecamatan", "value"),
+             Input("filter-bidang", "value"),
+             Input("filter-skala", "value"),
+             Input("highlight-store", "data"),
+             Input("geomap", "relayoutData"),
+             Input("tile-store", "data")],
+            [State("cube-store", "data"),
+             State("geomap", "figure"),
+             State("district-chart", "figure"),
+             State("business-type-chart", "figure")],
+            prevent_initial_call=True
+        )
+        
         @self.app.callback(
-            Output("export-button", "n_clicks"),
-            [Input("export-button", "n_clicks")]
+            Output("tile-store", "data"),
+            Input("geomap", "relayoutData"),
+            prevent_initial_call=True
         )
-        def export_map(n_clicks):
-            if n_clicks is not None and n_clicks > 0:
-                self.export_geomap()
-            return 0
+        def update_tiles(relayout):
+            if self.tiles is None or not relayout or 'mapbox.zoom' not in relayout:
+                return dash.no_update
+            return self.tile_cells(relayout)
+    
+    def warm_up(self):
+        """Build one layout so the figure cache and cube views are populated
+        
+        Called before gunicorn forks (wsgi.py), so every worker starts with
+        the data, cube and cached figures already in shared memory.
+        """
+        self.serve_layout()
+    
+    def setup_http(self, compress=True):
+        """Response compression and conditional requests
+        
+        Responses are compressed with brotli or gzip (flask-compress). The
+        layout gets a strong ETag and Last-Modified from the data snapshot,
+        and a matching revalidation is answered with 304 before the layout is
+        serialized. The index and dependency responses get content ETags.
+        Component bundles and assets already carry Dash/Flask cache headers;
+        the content-hashed boundary files are cached for a year.
+        """
+        if compress:
+            if Compress is None:
+                print("⚠️  flask-compress tidak terpasang, respons dikirim tanpa kompresi")
+            else:
+                # brotli where the browser supports it, gzip otherwise
+                self.server.config.update(COMPRESS_ALGORITHM=['br', 'gzip'], COMPRESS_BR_LEVEL=5)
+                Compress(self.server)
+        
+        prefix = self.app.config.routes_pathname_prefix
+        layout_path = f"{prefix}_dash-layout"
+        etag_paths = {prefix, f"{prefix}_dash-dependencies"}
+        
+        @self.server.before_request
+        def _pin_snapshot():
+            # Strip the encoding suffix so validators match the uncompressed
+            # ETags computed here and by Flask's send_file for assets
+            if 'HTTP_IF_NONE_MATCH' in request.environ:
+                request.environ['HTTP_IF_NONE_MATCH'] = COMPRESSED_ETAG_SUFFIX.sub(
+                    '"', request.environ['HTTP_IF_NONE_MATCH']
+                )
+            
+            # The 304 decision, the layout body and its headers all use this snapshot
+            g.umkm_snapshot = self._snapshot
+            if request.path == layout_path:
+                if self._not_modified(g.umkm_snapshot):
+                    response = self.server.response_class(status=304)
+                    self._set_validators(response, g.umkm_snapshot)
+                    return response
+        
+        # Runs before flask-compress's hook, which was registered first
+        @self.server.after_request
+        def _add_validators(response):
+            if request.method != 'GET' or response.status_code != 200:
+                return response
+            if request.path == layout_path:
+                self._set_validators(response, g.umkm_snapshot)
+            elif request.path in etag_paths:
+                response.add_etag()
+                response.cache_control.no_cache = True
+                response.make_conditional(request)
+            return response
+        
+        @self.server.route(f"{prefix}boundaries/<path:name>")
+        def _boundaries(name):
+            return send_from_directory(
+                self.boundaries_dir.resolve(), name, mimetype='application/json', max_age=BOUNDARY_MAX_AGE
+            )
+    
+    def _request_snapshot(self):
+        """Snapshot pinned for the current HTTP request, else the latest one"""
+        if has_request_context() and 'umkm_snapshot' in g:
+            return g.umkm_snapshot
+        return self._snapshot
+    
+    @staticmethod
+    def _not_modified(snapshot):
+        """Whether the request's ETag still matches ``snapshot``
+        
+        If-Modified-Since alone is never trusted: Last-Modified only follows
+        the data file, while the ETag also covers the dashboard code, library
+        versions, boundaries and tiles. Browsers send If-None-Match whenever
+        they hold an ETag, so this only costs IMS-only clients a full response.
+        """
+        if not request.if_none_match:
+            return False
+        return request.if_none_match.contains_weak(snapshot.etag)
+    
+    @staticmethod
+    def _set_validators(response, snapshot):
+        response.set_etag(snapshot.etag)
+        response.last_modified = snapshot.last_modified
+        # Cache, but revalidate on every visit so new data shows up at once
+        response.cache_control.no_cache = True
     
-    def run_server(self, debug=True, port=8050):
-        """Run the dashboard server"""
+    def run_server(self, debug=True, port=8050, watch=True):
+        """Run the dashboard server, hot-reloading the data file if ``watch``"""
+        if watch:
+            self.start_data_watcher()
         self.app.run_server(debug=debug, port=port)
 
 def main():
@@ -4,23 +4,45 @@ Generates a static HTML dashboard for GitHub Pages
 """
 
 import json
+import os
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import plotly.offline as pyo
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+from html import escape
 from pathlib import Path
+from umkm_payload import load_payload
+from figure_cache import get_figure_cache
+from content_hash import write_asset
+from plotly_bundle import write_bundle
+from geo_loader import load_districts
+from geomap_builder import BUILDER_REVISION, create_geomap_figure
+
+CHART_NAMES = ('geomap', 'district_chart', 'business_type_chart')
+
+# Marker sizing, shared with static/umkm_charts.js through the data blob
+MAP_MARKER = dict(size_min=15, size_max=50, size_scale=2)
+
+# Trace attributes filled in the browser from the data blob (lazy mode)
+DATA_ATTRIBUTES = ('x', 'y', 'lon', 'lat', 'text', 'customdata', 'labels', 'values')
+
+CHARTS_SCRIPT = Path(__file__).with_name('static') / 'umkm_charts.js'
+
+# Bootstrap subset with only the classes this page uses, served next to it
+STYLESHEET = Path(__file__).with_name('static') / 'bootstrap-umkm.min.css'
 
 class UMKMStaticDashboard:
     def __init__(self, data_path='data_output/umkm_data.json'):
         """Initialize dashboard with data"""
         self.data_path = Path(data_path)
+        self.figure_cache = get_figure_cache(self.data_path.parent / '.figure_cache')
         self.load_data()
         
     def load_data(self):
-        """Load data from JSON file"""
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        """Load data from umkm_data.json or its columnar (gzipped) variant"""
+        self.data = load_payload(self.data_path)
             
         # Convert to DataFrames for easier manipulation
         self.df = pd.DataFrame(self.data['data_lengkap'])
@@ -60,79 +82,9 @@ class UMKMStaticDashboard:
         </div>
         """
     
-    def create_geomap(self):
-        """Create geographic distribution map"""
-        # Load district coordinates from GeoJSON
-        try:
-            with open('umkm_tangerang_selatan_analysis/data/tangsel_districts.geojson', 'r') as f:
-                districts_data = json.load(f)
-        except:
-            # Fallback to hardcoded coordinates if file not found
-            districts_data = {
-                "features": [
-                    {"properties": {"name": "Serpong"}, "geometry": {"coordinates": [106.6647, -6.3197]}},
-                    {"properties": {"name": "Serpong Utara"}, "geometry": {"coordinates": [106.6747, -6.2997]}},
-                    {"properties": {"name": "Ciputat"}, "geometry": {"coordinates": [106.7147, -6.3297]}},
-                    {"properties": {"name": "Ciputat Timur"}, "geometry": {"coordinates": [106.7447, -6.3197]}},
-                    {"properties": {"name": "Pamulang"}, "geometry": {"coordinates": [106.7347, -6.3497]}},
-                    {"properties": {"name": "Pondok Aren"}, "geometry": {"coordinates": [106.7147, -6.2797]}},
-                    {"properties": {"name": "Setu"}, "geometry": {"coordinates": [106.6847, -6.3397]}}
-                ]
-            }
-        
-        # Create the map figure
-        fig = go.Figure()
-
-        # Add district markers with UMKM data
-        for district in districts_data['features']:
-            district_name = district['properties']['name']
-            lon, lat = district['geometry']['coordinates']
-            
-            # Get UMKM data for this district
-            district_data = self.df_kecamatan[self.df_kecamatan['Kecamatan'] == district_name]
-            if not district_data.empty:
-                district_data = district_data.iloc[0]
-                
-                # Calculate marker size based on total UMKM (scale it appropriately)
-                marker_size = max(15, min(50, np.sqrt(district_data['Total']) * 2))
-                
-                # Create color based on UMKM density
-                color_intensity = district_data['Total'] / self.df_kecamatan['Total'].max()
-                color = f'rgba(255, {int(255 * (1 - color_intensity))}, 0, 0.8)'
-                
-                # Add marker for this district
-                fig.add_trace(go.Scattermapbox(
-                    lon=[lon],
-                    lat=[lat],
-                    mode='markers',
-                    marker=dict(
-                        size=marker_size,
-                        color=color,
-                        opacity=0.8
-                    ),
-                    text=f"<b>{district_name}</b><br>" +
-                         f"Total UMKM: {district_data['Total']:,}<br>" +
-                         f"Mikro: {district_data['Mikro']:,}<br>" +
-                         f"Kecil: {district_data['Kecil']:,}",
-                    name=district_name,
-                    hoverinfo='text',
-                    showlegend=False
-                ))
-
-        # Update layout with map styling
-        fig.update_layout(
-            mapbox=dict(
-                style='open-street-map',
-                center=dict(lon=106.7047, lat=-6.3097),
-                zoom=11
-            ),
-            title="Peta Distribusi UMKM Tangerang Selatan<br><sub>Ukuran dan warna marker menunjukkan jumlah UMKM per kecamatan</sub>",
-            showlegend=False,
-            margin=dict(l=0, r=0, t=60, b=0),
-            height=600
-        )
-        
-        return fig
+    def create_geomap(self, **marker):
+        """Create geographic distribution map (``marker`` sizes the bubbles)"""
+        return create_geomap_figure(self.df_kecamatan, **marker)
     
     def create_district_chart(self):
         """Create district distribution chart"""
@@ -175,18 +127,120 @@ class UMKMStaticDashboard:
         
         return fig
     
-    def generate_html(self, output_path='index.html'):
-        """Generate static HTML dashboard"""
+    def get_figure(self, name):
+        """Return figure ``name`` (geomap, district_chart, business_type_chart) via the figure cache"""
+        if name == 'geomap':
+            return self.figure_cache.get_or_build(
+                self.data_path, name, self.create_geomap,
+                depends=[BUILDER_REVISION, load_districts().digest], **MAP_MARKER
+            )
+        return self.figure_cache.get_or_build(self.data_path, name, getattr(self, f'create_{name}'))
+    
+    def chart_spec(self, name):
+        """Layout and data-free trace skeletons of figure ``name``
         
-        # Create charts
-        geomap = self.create_geomap()
-        district_chart = self.create_district_chart()
-        business_chart = self.create_business_type_chart()
+        The plotly template is left out (it is shipped once for all charts)
+        and so are the data arrays, which static/umkm_charts.js fills in from
+        the compact data blob.
+        """
+        fig = self.get_figure(name).to_plotly_json()
+        traces = []
+        for trace in fig['data']:
+            trace = {key: value for key, value in trace.items() if key not in DATA_ATTRIBUTES}
+            if 'marker' in trace:
+                trace['marker'] = {key: value for key, value in trace['marker'].items()
+                                   if key not in ('size', 'color') or not isinstance(value, (list, tuple, np.ndarray))}
+            traces.append(trace)
         
-        # Convert charts to HTML
-        geomap_html = pyo.plot(geomap, output_type='div', include_plotlyjs=False)
-        district_chart_html = pyo.plot(district_chart, output_type='div', include_plotlyjs=False)
-        business_chart_html = pyo.plot(business_chart, output_type='div', include_plotlyjs=False)
+        layout = {key: value for key, value in fig['layout'].items() if key != 'template'}
+        return {'traces': traces, 'layout': layout}
+    
+    def create_chart_data(self):
+        """Compact data blob the browser builds every chart from"""
+        points = load_districts().points()
+        columns = lambda df, names: {name: df[name].tolist() for name in names}
+        
+        return {
+            'data': {
+                'kecamatan': columns(self.df_kecamatan, ['Kecamatan', 'Total', 'Mikro', 'Kecil']),
+                'bidang': columns(self.df_bidang, ['Bidang', 'Total']),
+                'districts': {
+                    'name': points['Kecamatan'].tolist(),
+                    'lon': points['lon'].tolist(),
+                    'lat': points['lat'].tolist()
+                },
+                'marker': MAP_MARKER
+            },
+            'charts': {name: self.chart_spec(name) for name in CHART_NAMES},
+            'template': self.get_figure(CHART_NAMES[0]).layout.template.to_plotly_json(),
+            'config': {'responsive': True}
+        }
+    
+    def render_figure(self, name):
+        """HTML div for figure ``name``, with a fixed div id so output is reproducible"""
+        return pio.to_html(
+            self.get_figure(name),
+            include_plotlyjs=False,
+            full_html=False,
+            div_id=name.replace('_', '-')
+        )
+    
+    def create_table_rows(self):
+        """District table rows, rendered column-wise instead of row by row"""
+        df = self.df_kecamatan
+        percentage = df['Total'] / df['Total'].sum() * 100
+        thousands = '{:,}'.format
+        
+        rows = (
+            """
+                                <tr>
+                                    <td><strong>""" + df['Kecamatan'].astype(str).map(escape) + """</strong></td>
+                                    <td>""" + df['Total'].map(thousands) + """</td>
+                                    <td>""" + df['Mikro'].map(thousands) + """</td>
+                                    <td>""" + df['Kecil'].map(thousands) + """</td>
+                                    <td>""" + percentage.map('{:.1f}%'.format) + """</td>
+                                </tr>
+"""
+        )
+        return ''.join(rows.tolist())
+    
+    def generate_html(self, output_path='index.html', plotly_bundle=None, lazy=True):
+        """Generate static HTML dashboard
+        
+        Plotly.js is written next to the page as a content-hashed file (see
+        plotly_bundle.write_bundle); ``plotly_bundle`` may name a prebuilt
+        partial bundle to ship instead of the full one.
+        
+        With ``lazy`` the page embeds one compact data blob and each chart is
+        built and rendered in the browser when it scrolls into view
+        (static/umkm_charts.js). Otherwise full figures are embedded and
+        rendered on load.
+        """
+        output_dir = Path(output_path).parent
+        plotly_src = write_bundle(output_dir, plotly_bundle)
+        stylesheet_href = write_asset(output_dir, 'bootstrap-umkm-', STYLESHEET.read_bytes(), suffix='.min.css')
+        
+        if lazy:
+            # Placeholders keep the page height stable until a chart renders
+            geomap_html, district_chart_html, business_chart_html = [
+                f'<div data-chart="{name}" style="min-height: {self.get_figure(name).layout.height}px"></div>'
+                for name in CHART_NAMES
+            ]
+            charts_src = write_asset(output_dir, 'umkm-charts-', CHARTS_SCRIPT.read_bytes())
+            # "</" must not appear inside the script element
+            chart_data = json.dumps(self.create_chart_data(), cls=PlotlyJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+            chart_data = chart_data.replace('</', '<\\/')
+            chart_scripts = f"""<script id="umkm-data" type="application/json">{chart_data}</script>
+    <script src="{charts_src}"></script>"""
+        else:
+            # Create charts and convert them to HTML
+            geomap_html, district_chart_html, business_chart_html = map(self.render_figure, CHART_NAMES)
+            chart_scripts = """<script>
+        // Make charts responsive
+        window.addEventListener('resize', function() {
+            document.querySelectorAll('.plotly-graph-div').forEach(div => Plotly.Plots.resize(div));
+        });
+    </script>"""
         
         # Create complete HTML
         html_content = f"""
@@ -197,11 +251,11 @@ class UMKMStaticDashboard:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Dashboard UMKM Tangerang Selatan</title>
     
-    <!-- Bootstrap CSS -->
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <!-- Bootstrap CSS (self-hosted subset) -->
+    <link href="{stylesheet_href}" rel="stylesheet">
     
-    <!-- Plotly.js -->
-    <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
+    <!-- Plotly.js (self-hosted) -->
+    <script src="{plotly_src}"></script>
     
     <style>
         body {{
@@ -310,18 +364,7 @@ class UMKMStaticDashboard:
 """
         
         # Add table rows
-        total_umkm = self.df_kecamatan['Total'].sum()
-        for _, row in self.df_kecamatan.iterrows():
-            percentage = (row['Total'] / total_umkm) * 100
-            html_content += f"""
-                                <tr>
-                                    <td><strong>{row['Kecamatan']}</strong></td>
-                                    <td>{row['Total']:,}</td>
-                                    <td>{row['Mikro']:,}</td>
-                                    <td>{row['Kecil']:,}</td>
-                                    <td>{percentage:.1f}%</td>
-                                </tr>
-"""
+        html_content += self.create_table_rows()
         
         html_content += f"""
                             </tbody>
@@ -348,15 +391,9 @@ class UMKMStaticDashboard:
         </div>
     </footer>
     
-    <!-- Bootstrap JS -->
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    {chart_scripts}
     
     <script>
-        // Make charts responsive
-        window.addEventListener('resize', function() {{
-            Plotly.Plots.resize();
-        }});
-        
         // Add smooth scrolling
         document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
             anchor.addEventListener('click', function (e) {{
@@ -371,9 +408,11 @@ class UMKMStaticDashboard:
 </html>
 """
         
-        # Write HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Write HTML file (then rename, so a half-written page is never served)
+        tmp_path = Path(output_path).with_name(Path(output_path).name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        os.replace(tmp_path, output_path)
         
         print(f"Static HTML dashboard generated: {output_path}")
         return output_path
@@ -1,96 +1,63 @@
 """
 Export Geomap for PowerPoint Embedding
-Creates a standalone HTML file of the UMKM distribution map
+Creates a standalone HTML file of the UMKM distribution map, or in batch mode
+one map per bidang and per skala as HTML and PNG (PNG needs kaleido)
 """
 
-import json
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from pathlib import Path
+import plotly.io as pio
+from geo_loader import load_districts
+from geomap_builder import MAP_CENTER, MAP_ZOOM, district_trace_spec
+from plotly_bundle import write_bundle
+from umkm_data_processor import UMKMCube
+from umkm_payload import load_payload
 
-def create_standalone_geomap(data_path='data_output/umkm_data.json', output_path='geomap_for_powerpoint.html'):
-    """Create standalone geomap HTML file for PowerPoint embedding"""
-    
-    # Load data
-    with open(data_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    df_kecamatan = pd.DataFrame(data['ringkasan_kecamatan'])
-    
-    # Load district coordinates
-    try:
-        with open('umkm_tangerang_selatan_analysis/data/tangsel_districts.geojson', 'r') as f:
-            districts_data = json.load(f)
-    except:
-        # Fallback coordinates
-        districts_data = {
-            "features": [
-                {"properties": {"name": "Serpong"}, "geometry": {"coordinates": [106.6647, -6.3197]}},
-                {"properties": {"name": "Serpong Utara"}, "geometry": {"coordinates": [106.6747, -6.2997]}},
-                {"properties": {"name": "Ciputat"}, "geometry": {"coordinates": [106.7147, -6.3297]}},
-                {"properties": {"name": "Ciputat Timur"}, "geometry": {"coordinates": [106.7447, -6.3197]}},
-                {"properties": {"name": "Pamulang"}, "geometry": {"coordinates": [106.7347, -6.3497]}},
-                {"properties": {"name": "Pondok Aren"}, "geometry": {"coordinates": [106.7147, -6.2797]}},
-                {"properties": {"name": "Setu"}, "geometry": {"coordinates": [106.6847, -6.3397]}}
-            ]
-        }
-    
-    # Create map figure
-    fig = go.Figure()
-    
-    # Add district markers
-    for district in districts_data['features']:
-        district_name = district['properties']['name']
-        lon, lat = district['geometry']['coordinates']
-        
-        # Get UMKM data for this district
-        district_data = df_kecamatan[df_kecamatan['Kecamatan'] == district_name]
-        if not district_data.empty:
-            district_data = district_data.iloc[0]
-            
-            # Calculate marker size and color
-            marker_size = max(20, min(60, np.sqrt(district_data['Total']) * 2.5))
-            color_intensity = district_data['Total'] / df_kecamatan['Total'].max()
-            color = f'rgba(255, {int(255 * (1 - color_intensity))}, 0, 0.9)'
-            
-            # Add marker
-            fig.add_trace(go.Scattermapbox(
-                lon=[lon],
-                lat=[lat],
-                mode='markers',
-                marker=dict(
-                    size=marker_size,
-                    color=color,
-                    opacity=0.9,
-                    sizemode='diameter'
-                ),
-                text=f"<b>{district_name}</b><br>" +
-                     f"Total UMKM: {district_data['Total']:,}<br>" +
-                     f"Mikro: {district_data['Mikro']:,}<br>" +
-                     f"Kecil: {district_data['Kecil']:,}",
-                name=district_name,
-                hoverinfo='text',
-                showlegend=False
-            ))
-    
-    # Update layout for PowerPoint embedding
-    fig.update_layout(
+EXPORT_TITLE = "Peta Distribusi UMKM Tangerang Selatan"
+
+# Larger, more opaque markers than the dashboard, for slides
+MAP_OPTIONS = dict(size_min=20, size_max=60, size_scale=2.5, opacity=0.9, alpha=0.9, sizemode='diameter')
+
+IMAGE_SIZE = dict(width=900, height=600)
+
+HTML_CONFIG = {
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ['pan2d', 'lasso2d', 'select2d'],
+    'toImageButtonOptions': {
+        'format': 'png',
+        'filename': 'umkm_map_tangsel',
+        'height': IMAGE_SIZE['height'],
+        'width': IMAGE_SIZE['width'],
+        'scale': 2
+    }
+}
+
+def export_layout(title=EXPORT_TITLE):
+    """Layout shared by every exported map"""
+    return dict(
         mapbox=dict(
             style='open-street-map',
-            center=dict(lon=106.7047, lat=-6.3097),
-            zoom=11
+            center=MAP_CENTER,
+            zoom=MAP_ZOOM
         ),
         title={
-            'text': "Peta Distribusi UMKM Tangerang Selatan",
+            'text': title,
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 20, 'color': 'darkblue'}
         },
         showlegend=False,
         margin=dict(l=10, r=10, t=80, b=10),
-        height=600,
-        width=900,
         font=dict(family="Arial, sans-serif", size=12),
         annotations=[
             dict(
@@ -100,25 +67,35 @@ def create_standalone_geomap(data_path='data_output/umkm_data.json', output_path
                 x=0.5, y=-0.05, xanchor='center', yanchor='top',
                 font=dict(size=12, color="gray")
             )
-        ]
+        ],
+        **IMAGE_SIZE
+    )
+
+def create_standalone_geomap(data_path='data_output/umkm_data.json', output_path='geomap_for_powerpoint.html',
+                             plotly_bundle=None, inline=False):
+    """Create standalone geomap HTML file for PowerPoint embedding
+    
+    Plotly.js is written next to the HTML file as a shared, content-hashed
+    assets/plotly-<hash>.min.js, as in batch mode (``plotly_bundle`` may
+    name another bundle). With ``inline`` it is embedded in the HTML
+    instead (about 3.5 MB), so the single file can be attached on its own.
+    """
+    
+    # Load data
+    data = load_payload(data_path)
+    df_kecamatan = pd.DataFrame(data['ringkasan_kecamatan'])
+    
+    # Create map figure: one trace for all districts
+    fig = go.Figure(
+        data=[go.Scattermapbox(district_trace_spec(df_kecamatan, load_districts(), **MAP_OPTIONS))],
+        layout=export_layout()
     )
     
     # Export as HTML
     fig.write_html(
         output_path,
-        config={
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['pan2d', 'lasso2d', 'select2d'],
-            'toImageButtonOptions': {
-                'format': 'png',
-                'filename': 'umkm_map_tangsel',
-                'height': 600,
-                'width': 900,
-                'scale': 2
-            }
-        },
-        include_plotlyjs='cdn'
+        config=HTML_CONFIG,
+        include_plotlyjs=True if inline else write_bundle(Path(output_path).parent, plotly_bundle)
     )
     
     print(f"✅ Geomap exported successfully to: {output_path}")
@@ -127,5 +104,127 @@ def create_standalone_geomap(data_path='data_output/umkm_data.json', output_path
     print("   2. Or use Insert > Online Video > paste the HTML file path")
     print("   3. Or take a screenshot of the map for static embedding")
 
+def slugify(name):
+    """File-name friendly form of a bidang or skala name"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+def export_variants(cube):
+    """(file stem, title, UMKMCube.subset arguments) of every batch map"""
+    variants = [('geomap_semua', EXPORT_TITLE, {})]
+    variants += [
+        (f"geomap_bidang_{slugify(bidang)}", f"{EXPORT_TITLE}<br><sub>Bidang {bidang}</sub>", {'bidang': [bidang]})
+        for bidang in cube.bidang
+    ]
+    variants += [
+        (f"geomap_skala_{slugify(skala)}", f"{EXPORT_TITLE}<br><sub>Usaha {skala}</sub>", {'skala': [skala]})
+        for skala in cube.SKALA
+    ]
+    return variants
+
+# Per-process state for batch workers, set once by _init_worker
+_worker = {}
+
+def _init_worker(layout, plotly_js, png):
+    _worker.update(layout=layout, plotly_js=plotly_js, png=png)
+
+def _render_variant(output_dir, stem, title, trace):
+    """Write one batch map; returns (written paths, seconds)"""
+    start = time.perf_counter()
+    layout = dict(_worker['layout'], title=dict(_worker['layout']['title'], text=title))
+    fig = {'data': [trace], 'layout': layout}
+    
+    html_path = Path(output_dir) / f"{stem}.html"
+    html = pio.to_html(fig, config=HTML_CONFIG, include_plotlyjs=_worker['plotly_js'], div_id=stem, validate=False)
+    html_path.write_text(html, encoding='utf-8')
+    paths = [str(html_path)]
+    
+    if _worker['png']:
+        png_path = html_path.with_suffix('.png')
+        pio.write_image(fig, png_path, format='png', scale=2, validate=False, **IMAGE_SIZE)
+        paths.append(str(png_path))
+    return paths, time.perf_counter() - start
+
+def export_geomap_batch(data_path='data_output/umkm_data.json', output_dir='geomap_export', workers=None,
+                        png=True, plotly_bundle=None):
+    """Export one map for all UMKM, per bidang and per skala
+    
+    The data and district geometry are loaded once, every variant's trace is
+    derived from one UMKMCube, and the shared layout and Plotly.js bundle
+    reach each worker process once. Maps are rendered as HTML on a process
+    pool of ``workers``; PNGs are written too when ``png``, which then
+    requires kaleido (RuntimeError before anything is written if it is
+    missing, and after the other maps if any map fails to render). Returns
+    the written paths.
+    """
+    if png and importlib.util.find_spec('kaleido') is None:
+        raise RuntimeError("kaleido tidak terpasang, PNG tidak bisa dibuat (pip install kaleido, atau pakai --no-png)")
+    
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Load inputs once
+    data = load_payload(data_path)
+    cube = UMKMCube.from_frame(pd.DataFrame(data['data_lengkap']))
+    districts = load_districts()
+    
+    # Shared base figure: validated once, then sent to workers as a plain dict
+    layout = go.Figure(layout=export_layout()).to_plotly_json()['layout']
+    plotly_js = write_bundle(output_dir, plotly_bundle)
+    
+    tasks = []
+    for stem, title, subset in export_variants(cube):
+        view = cube.subset(**subset)
+        df_kecamatan = view.summary(0)
+        df_kecamatan.insert(0, 'Kecamatan', view.kecamatan.to_numpy())
+        df_kecamatan = df_kecamatan[df_kecamatan['Total'] > 0]
+        tasks.append((stem, title, district_trace_spec(df_kecamatan, districts, **MAP_OPTIONS)))
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"🗺️  Mengekspor {len(tasks)} peta ke '{output_dir}' ({workers} proses, PNG: {'ya' if png else 'tidak'})")
+    
+    written, failed = [], []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(layout, plotly_js, png)) as pool:
+        futures = [pool.submit(_render_variant, str(output_dir), *task) for task in tasks]
+        for (stem, _, _), future in zip(tasks, futures):
+            try:
+                paths, seconds = future.result()
+            except Exception as e:
+                # e.g. kaleido cannot fetch the OpenStreetMap tiles offline
+                failed.append(stem)
+                print(f"   ❌ {stem:<40} {e}")
+                continue
+            written.extend(paths)
+            print(f"   ✅ {stem:<40} {seconds:.2f} dtk")
+    
+    print(f"✅ {len(written)} file dalam {time.perf_counter() - start:.2f} dtk")
+    if failed:
+        raise RuntimeError(f"{len(failed)} dari {len(tasks)} peta gagal dirender")
+    return written
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Ekspor peta UMKM untuk presentasi')
+    parser.add_argument('--data', default='data_output/umkm_data.json', help='file data dashboard')
+    parser.add_argument('--output', default='geomap_for_powerpoint.html', help='file HTML (mode tunggal)')
+    parser.add_argument('--batch', action='store_true', help='satu peta per bidang dan per skala')
+    parser.add_argument('--output-dir', default='geomap_export', help='folder output mode batch')
+    parser.add_argument('--workers', type=int, default=None, help='jumlah proses render (default: jumlah CPU)')
+    parser.add_argument('--no-png', action='store_true', help='hanya HTML pada mode batch')
+    parser.add_argument('--inline', action='store_true',
+                        help='mode tunggal: tanam Plotly.js di dalam HTML (satu file, ±3,5 MB)')
+    args = parser.parse_args(argv)
+    
+    if args.batch:
+        try:
+            export_geomap_batch(args.data, args.output_dir, workers=args.workers, png=not args.no_png)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+    else:
+        create_standalone_geomap(args.data, args.output, inline=args.inline)
+    return 0
+
 if __name__ == "__main__":
-    create_standalone_geomap()
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+🗃️ Figure Cache - Shared Plotly Figure Cache
+In-memory LRU plus on-disk tier for figures, keyed by the source data
+version and the figure parameters
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import plotly
+import plotly.io as pio
+
+def code_digest(code):
+    """sha256 of a code object's bytecode and constants, nested code included
+
+    The repr of a nested code object carries its memory address, so nested
+    functions and lambdas are hashed recursively instead.
+    """
+    h = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        h.update(code_digest(const).encode() if hasattr(const, 'co_code') else repr(const).encode())
+    return h.hexdigest()
+
+class FigureCache:
+    """Two-tier cache of Plotly figures
+
+    Keys combine the sha256 of the source data file, the figure name, its
+    parameters, the builder's code, the caller's ``depends`` values and the
+    plotly version, so a new data file or a changed builder never returns a
+    stale figure. The data hash is only
+    recomputed when the file's size or mtime changes. Cached figures are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, cache_dir, max_items=32, max_disk_items=256):
+        self.cache_dir = Path(cache_dir)
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self._memory = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = {'memory': 0, 'disk': 0, 'build': 0}
+
+    def data_version(self, data_path):
+        """Content hash of a data file, memoized on (size, mtime)"""
+        data_path = Path(data_path).resolve()
+        stat = data_path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        cached = self._versions.get(data_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        h = hashlib.sha256()
+        with open(data_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        version = h.hexdigest()
+        self._versions[data_path] = (signature, version)
+        return version
+
+    def key(self, data_path, name, builder, params, version=None, depends=None):
+        """Cache key for one figure of one data version"""
+        spec = {
+            'data': version or self.data_version(data_path),
+            'figure': name,
+            'params': params,
+            'builder': code_digest(builder.__code__),
+            'depends': depends,
+            'plotly': plotly.__version__
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_or_build(self, data_path, name, builder, version=None, depends=None, **params):
+        """Return the cached figure, loading it from disk or building it if needed
+
+        ``version`` overrides the data hash when the caller already knows the
+        exact version its builder will read (e.g. a loaded data snapshot).
+        Styling the builder reads should be passed as ``params``; ``depends``
+        adds anything else it reads (module revisions, reference data) to the
+        key without passing it to the builder.
+        """
+        key = self.key(data_path, name, builder, params, version=version, depends=depends)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits['memory'] += 1
+                return self._memory[key]
+
+        disk_path = self.cache_dir / f"{key}.json"
+        try:
+            fig = pio.from_json(disk_path.read_text(encoding='utf-8'))
+            self.hits['disk'] += 1
+        except (OSError, ValueError):
+            fig = builder(**params)
+            self.hits['build'] += 1
+            self._write_disk(disk_path, fig)
+
+        with self._lock:
+            self._memory[key] = fig
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+        return fig
+
+    def _write_disk(self, disk_path, fig):
+        """Atomically write a figure and keep the disk tier bounded"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = disk_path.with_name(f"{disk_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(fig.to_json(), encoding='utf-8')
+        os.replace(tmp_path, disk_path)
+
+        entries = sorted(self.cache_dir.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        for stale in entries[:-self.max_disk_items]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left for other processes)"""
+        with self._lock:
+            self._memory.clear()
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_figure_cache(cache_dir):
+    """Process-wide FigureCache for ``cache_dir``, shared by every dashboard"""
+    cache_dir = Path(cache_dir).resolve()
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = FigureCache(cache_dir)
+        return _caches[cache_dir]
@@ -1,14 +1,151 @@
+"""
+🏗️ Generate Static - GitHub Pages Build
+Builds docs/index.html from the processed data and skips the build when
+neither the data nor the generator changed since the last run
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
 import os
+import re
+import sys
+import time
+from importlib import metadata
 from pathlib import Path
-from dashboard_umkm_static import UMKMStaticDashboard
 
-# Change to the script directory
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = 'data_output/umkm_data.json'
+DOCS_DIR = 'docs'
+MANIFEST_NAME = '.build_manifest.json'
+
+# Modules and files whose content shapes the generated page
+SOURCE_FILES = (
+    'generate_static.py',
+    'dashboard_umkm_static.py',
+    'content_hash.py',
+    'figure_cache.py',
+    'geomap_builder.py',
+    'geo_loader.py',
+    'plotly_bundle.py',
+    'umkm_payload.py',
+    'static/umkm_charts.js',
+    'static/bootstrap-umkm.min.css',
+    'data/tangsel_districts.geojson'
+)
+
+ASSET_PATTERN = re.compile(r'(?:src|href)="(assets/[^"]+)"')
+
+def file_digest(path):
+    """sha256 hex digest of a file's content"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def data_digest(raw):
+    """Hash of the dashboard data ignoring metadata.last_updated
+
+    A processor run on unchanged CSVs only moves the timestamp; that must
+    not force a rebuild. Uses the standard library only, so the check stays
+    fast when nothing has to be built.
+    """
+    if raw[:2] == b'\x1f\x8b':
+        raw = gzip.decompress(raw)
+    data = json.loads(raw.decode('utf-8'))
+    data.get('metadata', {}).pop('last_updated', None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def build_inputs(data_path, manifest, eager=False):
+    """Fingerprint of everything the page is built from"""
+    raw = Path(data_path).read_bytes()
+    raw_digest = hashlib.sha256(raw).hexdigest()
+
+    # Unchanged file: reuse the normalized hash instead of parsing it again
+    previous = manifest.get('inputs', {})
+    if manifest.get('data_file_sha256') == raw_digest and 'data' in previous:
+        data = previous['data']
+    else:
+        data = data_digest(raw)
+
+    bundle = os.environ.get('PLOTLY_BUNDLE')
+    inputs = {
+        'data': data,
+        'code': {name: file_digest(name) for name in SOURCE_FILES},
+        'plotly': metadata.version('plotly'),
+        'plotly_bundle': file_digest(bundle) if bundle else None,
+        'eager': eager
+    }
+    return inputs, raw_digest
+
+def read_manifest(docs_dir):
+    try:
+        with open(Path(docs_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def outputs_intact(docs_dir, manifest):
+    """Whether every file recorded by the last build is still as written"""
+    outputs = manifest.get('outputs')
+    if not outputs:
+        return False
+    for name, digest in outputs.items():
+        path = Path(docs_dir) / name
+        if not path.exists() or file_digest(path) != digest:
+            return False
+    return True
+
+def build(data_path, docs_dir, lazy=True):
+    """Generate the page and return {relative path: sha256} of its outputs"""
+    # Imported here so an up-to-date check doesn't pay for pandas/plotly
+    from dashboard_umkm_static import UMKMStaticDashboard
+
+    output_path = Path(docs_dir) / 'index.html'
+    dashboard = UMKMStaticDashboard(data_path=data_path)
+    dashboard.generate_html(str(output_path), lazy=lazy)
+
+    html = output_path.read_text(encoding='utf-8')
+    names = ['index.html'] + sorted(set(ASSET_PATTERN.findall(html)))
+    return {name: file_digest(Path(docs_dir) / name) for name in names}
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Bangun dashboard statis untuk GitHub Pages')
+    parser.add_argument('--data', help=f'file data dashboard (default: {DATA_PATH})')
+    parser.add_argument('--docs', help=f'folder output (default: {DOCS_DIR})')
+    parser.add_argument('--force', action='store_true', help='bangun ulang walau input tidak berubah')
+    parser.add_argument('--eager', action='store_true', help='render semua figure saat build, bukan di browser')
+    args = parser.parse_args(argv)
+
+    # Paths given on the command line are relative to where it was run
+    data_path = Path(args.data).resolve() if args.data else DATA_PATH
+    docs_dir = Path(args.docs).resolve() if args.docs else Path(DOCS_DIR)
+
+    # Change to the script directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    start = time.perf_counter()
+    docs_dir.mkdir(exist_ok=True)
+
+    manifest = read_manifest(docs_dir)
+    inputs, raw_digest = build_inputs(data_path, manifest, eager=args.eager)
+
+    if not args.force and manifest.get('inputs') == inputs and outputs_intact(docs_dir, manifest):
+        print(f"✅ {docs_dir / 'index.html'} sudah terbaru, build dilewati ({time.perf_counter() - start:.3f} dtk)")
+        return 0
+
+    outputs = build(data_path, docs_dir, lazy=not args.eager)
+
+    manifest = {'inputs': inputs, 'data_file_sha256': raw_digest, 'outputs': outputs}
+    tmp_path = docs_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, docs_dir / MANIFEST_NAME)
 
-# Create docs directory if it doesn't exist
-docs_dir = Path('docs')
-docs_dir.mkdir(exist_ok=True)
+    print(f"✅ Build selesai dalam {time.perf_counter() - start:.3f} dtk")
+    return 0
 
-# Generate static dashboard
-dashboard = UMKMStaticDashboard()
-dashboard.generate_html(str(docs_dir / 'index.html'))
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+🌐 Geo Loader - Shared District Geometry
+Reads the district GeoJSON once per process from the package's data folder,
+validates its features and offers a name → geometry/centroid lookup shared by
+every map builder
+"""
+
+import functools
+import hashlib
+import json
+import math
+from pathlib import Path
+
+import pandas as pd
+from shapely.geometry import shape
+
+# Resolved against this file, so it works from any working directory
+DISTRICTS_PATH = Path(__file__).resolve().parent / 'data' / 'tangsel_districts.geojson'
+
+# Used, with a warning, when the GeoJSON file is missing or has no valid feature
+FALLBACK_DISTRICTS = {
+    "type": "FeatureCollection",
+    "features": [
+        {"type": "Feature", "properties": {"name": "Serpong"},
+         "geometry": {"type": "Point", "coordinates": [106.6647, -6.3197]}},
+        {"type": "Feature", "properties": {"name": "Serpong Utara"},
+         "geometry": {"type": "Point", "coordinates": [106.6747, -6.2997]}},
+        {"type": "Feature", "properties": {"name": "Ciputat"},
+         "geometry": {"type": "Point", "coordinates": [106.7147, -6.3297]}},
+        {"type": "Feature", "properties": {"name": "Ciputat Timur"},
+         "geometry": {"type": "Point", "coordinates": [106.7447, -6.3197]}},
+        {"type": "Feature", "properties": {"name": "Pamulang"},
+         "geometry": {"type": "Point", "coordinates": [106.7347, -6.3497]}},
+        {"type": "Feature", "properties": {"name": "Pondok Aren"},
+         "geometry": {"type": "Point", "coordinates": [106.7147, -6.2797]}},
+        {"type": "Feature", "properties": {"name": "Setu"},
+         "geometry": {"type": "Point", "coordinates": [106.6847, -6.3397]}}
+    ]
+}
+
+def feature_centroid(feature):
+    """(lon, lat) of a Point feature, or the centroid of a (Multi)Polygon
+
+    Raises ValueError for any other geometry or invalid coordinates.
+    """
+    geometry = feature.get('geometry') or {}
+    kind = geometry.get('type')
+    if kind == 'Point':
+        lon, lat = (float(value) for value in geometry['coordinates'][:2])
+    elif kind in ('Polygon', 'MultiPolygon'):
+        centroid = shape(geometry).centroid
+        lon, lat = centroid.x, centroid.y
+    else:
+        raise ValueError(f"geometri {kind} tidak didukung")
+
+    if not (math.isfinite(lon) and math.isfinite(lat) and -180 <= lon <= 180 and -90 <= lat <= 90):
+        raise ValueError(f"koordinat tidak valid ({lon}, {lat})")
+    return lon, lat
+
+class DistrictIndex:
+    """Validated district features with a name → geometry/centroid lookup"""
+
+    def __init__(self, collection, source=None):
+        self.source = source
+        self.features = []
+        self.centroids = {}
+        self.problems = []
+
+        for i, feature in enumerate(collection.get('features', [])):
+            name = (feature.get('properties') or {}).get('name')
+            if not isinstance(name, str) or not name.strip():
+                self.problems.append(f"feature {i}: tanpa properties.name")
+                continue
+            if name in self.centroids:
+                self.problems.append(f"'{name}': nama ganda, feature berikutnya diabaikan")
+                continue
+            try:
+                self.centroids[name] = feature_centroid(feature)
+            except (KeyError, TypeError, ValueError) as e:
+                self.problems.append(f"'{name}': {e}")
+                continue
+            self.features.append(feature)
+
+        self._by_name = {feature['properties']['name']: feature for feature in self.features}
+        # Identifies the loaded geometry, e.g. for cache keys of derived figures
+        self.digest = hashlib.sha256(
+            json.dumps(self.features, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        ).hexdigest()
+        self._points = pd.DataFrame({
+            'Kecamatan': list(self.centroids),
+            'lon': [lon for lon, _ in self.centroids.values()],
+            'lat': [lat for _, lat in self.centroids.values()]
+        })
+
+    @property
+    def names(self):
+        return list(self.centroids)
+
+    @property
+    def collection(self):
+        """The valid features as a GeoJSON FeatureCollection"""
+        return {'type': 'FeatureCollection', 'features': self.features}
+
+    def geometry(self, name):
+        """GeoJSON geometry of district ``name``, or None"""
+        feature = self._by_name.get(name)
+        return None if feature is None else feature['geometry']
+
+    def centroid(self, name):
+        """(lon, lat) of district ``name``, or None"""
+        return self.centroids.get(name)
+
+    def points(self):
+        """DataFrame of district name, lon and lat in feature order"""
+        return self._points.copy()
+
+    def __len__(self):
+        return len(self.features)
+
+def read_districts(path=DISTRICTS_PATH):
+    """Parse and validate ``path``, falling back to FALLBACK_DISTRICTS with a warning"""
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+        if not isinstance(collection, dict) or collection.get('type') != 'FeatureCollection':
+            raise ValueError("bukan FeatureCollection")
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Gagal membaca '{path}' ({e}), memakai koordinat kecamatan bawaan")
+        return DistrictIndex(FALLBACK_DISTRICTS, source=None)
+
+    districts = DistrictIndex(collection, source=path)
+    for problem in districts.problems:
+        print(f"⚠️  {path.name}: {problem}")
+    if not len(districts):
+        print(f"⚠️  '{path}' tidak berisi feature valid, memakai koordinat kecamatan bawaan")
+        return DistrictIndex(FALLBACK_DISTRICTS, source=None)
+    return districts
+
+@functools.lru_cache(maxsize=None)
+def _load_districts(path):
+    return read_districts(path)
+
+def load_districts(path=DISTRICTS_PATH):
+    """Shared DistrictIndex for ``path``, parsed once per process
+
+    Relative paths are resolved against the package folder, not the working
+    directory. The returned index is shared; treat it as read-only.
+    """
+    path = Path(path)
+    if not path.is_absolute():
+        path = DISTRICTS_PATH.parent.parent / path
+    return _load_districts(path.resolve())
@@ -0,0 +1,157 @@
+"""
+🗺️ Geomap Builder - Shared District Map Construction
+Joins district locations to UMKM data once and emits a single array-backed
+Scattermapbox (or, with boundary polygons, Choroplethmapbox) trace, used by
+the Dash app, the static page and the exporter
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+
+from geo_loader import load_districts
+
+# Passed as a figure cache dependency by the callers: a change to the trace
+# construction here must not serve figures built by the previous version
+BUILDER_REVISION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+MAP_CENTER = dict(lon=106.7047, lat=-6.3097)
+MAP_ZOOM = 11
+
+MAP_TITLE = ("Peta Distribusi UMKM Tangerang Selatan<br><sub>Ukuran dan warna marker "
+             "menunjukkan jumlah UMKM per kecamatan</sub>")
+
+def hover_text(df):
+    """Hover label per row of a Kecamatan/Total/Mikro/Kecil frame"""
+    text = (
+        '<b>' + df['Kecamatan'] + '</b><br>'
+        + 'Total UMKM: ' + df['Total'].map('{:,}'.format) + '<br>'
+        + 'Mikro: ' + df['Mikro'].map('{:,}'.format) + '<br>'
+        + 'Kecil: ' + df['Kecil'].map('{:,}'.format)
+    )
+    return text.to_numpy()
+
+def district_trace_spec(df_kecamatan, districts, size_min=15, size_max=50, size_scale=2,
+                        opacity=0.8, alpha=0.8, **marker):
+    """Plain-dict Scattermapbox trace for all districts with data
+
+    ``districts`` is a geo_loader.DistrictIndex, joined to ``df_kecamatan``
+    once. Marker size is sqrt(Total) * size_scale clipped to [size_min,
+    size_max] and colour runs from yellow to red relative to the largest
+    district total. The dict skips plotly's validation, so callbacks can
+    return it directly.
+    """
+    points = districts.points().merge(
+        df_kecamatan[['Kecamatan', 'Total', 'Mikro', 'Kecil']], on='Kecamatan', how='inner'
+    )
+    total = points['Total'].to_numpy()
+    max_total = df_kecamatan['Total'].max() if len(df_kecamatan) else 0
+
+    return dict(
+        type='scattermapbox',
+        lon=points['lon'].to_numpy(),
+        lat=points['lat'].to_numpy(),
+        mode='markers',
+        marker=dict(
+            size=np.clip(np.sqrt(total) * size_scale, size_min, size_max),
+            color=total,
+            colorscale=[[0, f'rgba(255, 255, 0, {alpha})'], [1, f'rgba(255, 0, 0, {alpha})']],
+            cmin=0,
+            cmax=max(max_total, 1),
+            opacity=opacity,
+            **marker
+        ),
+        text=hover_text(points),
+        customdata=points['Kecamatan'].to_numpy(),
+        name='Kecamatan',
+        hoverinfo='text',
+        showlegend=False
+    )
+
+def choropleth_trace_spec(df_kecamatan, geojson, opacity=0.7, alpha=0.8):
+    """Plain-dict Choroplethmapbox trace filling each district polygon
+
+    ``geojson`` is a FeatureCollection or the URL of one (see boundaries.py)
+    whose features carry properties.name. Colours match district_trace_spec.
+    """
+    df = df_kecamatan[['Kecamatan', 'Total', 'Mikro', 'Kecil']]
+    max_total = df['Total'].max() if len(df) else 0
+
+    return dict(
+        type='choroplethmapbox',
+        geojson=geojson,
+        featureidkey='properties.name',
+        locations=df['Kecamatan'].to_numpy(),
+        z=df['Total'].to_numpy(),
+        colorscale=[[0, f'rgba(255, 255, 0, {alpha})'], [1, f'rgba(255, 0, 0, {alpha})']],
+        zmin=0,
+        zmax=max(max_total, 1),
+        marker=dict(opacity=opacity, line=dict(width=1, color='white')),
+        text=hover_text(df),
+        customdata=df['Kecamatan'].to_numpy(),
+        name='Kecamatan',
+        hoverinfo='text',
+        showscale=False,
+        showlegend=False
+    )
+
+def density_trace_spec(cells, radius=12, opacity=0.6):
+    """Plain-dict Densitymapbox trace of tile pyramid cells (see tile_pyramid.py)
+
+    ``cells`` holds lon, lat and count lists plus the max count of their
+    pyramid level, which fixes the colour scale while the map is panned.
+    """
+    return dict(
+        type='densitymapbox',
+        lon=cells['lon'],
+        lat=cells['lat'],
+        z=cells['count'],
+        zmin=0,
+        zmax=max(cells['max_count'], 1),
+        radius=radius,
+        opacity=opacity,
+        colorscale='YlOrRd',
+        name='Kepadatan usaha',
+        hoverinfo='skip',
+        showscale=False,
+        showlegend=False
+    )
+
+def district_trace(df_kecamatan, districts, **options):
+    """One Scattermapbox trace for all districts with data (see district_trace_spec)"""
+    return go.Scattermapbox(district_trace_spec(df_kecamatan, districts, **options))
+
+def geomap_layout(title=MAP_TITLE, height=600):
+    """Layout dict shared by the dashboard geomaps"""
+    return dict(
+        mapbox=dict(
+            style='open-street-map',
+            center=MAP_CENTER,
+            zoom=MAP_ZOOM
+        ),
+        title=title,
+        showlegend=False,
+        margin=dict(l=0, r=0, t=60, b=0),
+        height=height
+    )
+
+def create_geomap_figure(df_kecamatan, districts=None, title=MAP_TITLE, height=600, boundaries=None,
+                         density=None, **trace_options):
+    """Dashboard geomap figure on an OpenStreetMap base
+
+    With ``boundaries`` (a polygon FeatureCollection or its URL) districts
+    are filled as a choropleth, otherwise drawn as one bubble trace.
+    ``density`` (a density_trace_spec dict) adds a second, business-density
+    trace.
+    """
+    if boundaries is not None:
+        trace = go.Choroplethmapbox(choropleth_trace_spec(df_kecamatan, boundaries))
+    else:
+        if districts is None:
+            districts = load_districts()
+        trace = district_trace(df_kecamatan, districts, **trace_options)
+
+    data = [trace] if density is None else [trace, go.Densitymapbox(density)]
+    return go.Figure(data=data, layout=geomap_layout(title=title, height=height))
@@ -0,0 +1,44 @@
+"""
+⚙️ Gunicorn Configuration - Dashboard UMKM
+Preloads wsgi.py in the master process so the data snapshot, cube and
+cached figures are shared copy-on-write by all workers.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('UMKM_BIND', '0.0.0.0:8050')
+
+# Load the app (and its data) once, before forking
+preload_app = True
+
+# Callbacks run in the browser, so workers mostly serve layouts and assets:
+# a few processes with a couple of threads each keep every core busy
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('UMKM_THREADS', 4))
+
+# A layout build is milliseconds; anything near the timeout is a stuck worker
+timeout = int(os.environ.get('UMKM_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then; with preload_app a new worker is just a fork
+max_requests = 5000
+max_requests_jitter = 500
+
+accesslog = os.environ.get('UMKM_ACCESS_LOG')
+errorlog = '-'
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the GC's reach, so collections in
+    # the workers don't touch (and un-share) the preloaded pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Threads don't survive fork: each worker runs its own data watcher
+    from wsgi import dashboard
+    dashboard.start_data_watcher()
@@ -0,0 +1,116 @@
+"""
+🔥 Load Test - Dashboard Throughput
+Sends concurrent requests to a running dashboard and reports requests/sec
+and latency percentiles per path
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# What a page load fetches from the server (callbacks run in the browser)
+DEFAULT_PATHS = ['/', '/_dash-layout', '/_dash-dependencies']
+
+def run_client(host, port, paths, deadline, headers):
+    """Request ``paths`` round-robin on one keep-alive connection until ``deadline``"""
+    latencies = {path: [] for path in paths}
+    errors = 0
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = 0
+
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+
+        if response.status >= 400:
+            errors += 1
+        else:
+            latencies[path].append(time.perf_counter() - start)
+
+    conn.close()
+    return latencies, errors
+
+def percentile(values, q):
+    """q-th percentile (0-100) of a sorted list"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+def run_load_test(url, paths=None, concurrency=16, duration=20.0, headers=None):
+    """Run the load test and return a JSON-serialisable report"""
+    paths = paths or DEFAULT_PATHS
+    target = urlsplit(url)
+    deadline = time.perf_counter() + duration
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(run_client, target.hostname, target.port or 80, paths, deadline, headers or {})
+            for _ in range(concurrency)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    report = {'url': url, 'concurrency': concurrency, 'seconds': round(elapsed, 3), 'paths': {}}
+    total = 0
+    for path in paths:
+        values = sorted(v for latencies, _ in results for v in latencies[path])
+        total += len(values)
+        report['paths'][path] = {
+            'requests': len(values),
+            'p50_ms': None if not values else round(percentile(values, 50) * 1000, 2),
+            'p95_ms': None if not values else round(percentile(values, 95) * 1000, 2),
+            'p99_ms': None if not values else round(percentile(values, 99) * 1000, 2)
+        }
+    report['requests'] = total
+    report['errors'] = sum(errors for _, errors in results)
+    report['requests_per_sec'] = round(total / elapsed, 1)
+    return report
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Uji beban dashboard UMKM yang sedang berjalan')
+    parser.add_argument('--url', default='http://127.0.0.1:8050', help='alamat dashboard')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='path yang diminta bergiliran')
+    parser.add_argument('--concurrency', type=int, default=16, help='jumlah klien bersamaan')
+    parser.add_argument('--duration', type=float, default=20.0, help='durasi uji (detik)')
+    parser.add_argument('--header', action='append', default=[], metavar='NAMA:NILAI',
+                        help='header tambahan, mis. "Accept-Encoding: gzip"')
+    parser.add_argument('--output', help='simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    headers = dict(header.split(':', 1) for header in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+    print(f"\n🔥 UJI BEBAN {args.url} ({args.concurrency} klien, {args.duration:g} dtk)")
+    print("=" * 60)
+    report = run_load_test(args.url, args.paths, args.concurrency, args.duration, headers)
+
+    for path, stats in report['paths'].items():
+        print(f"   {path:<24} {stats['requests']:>7,} req  p50 {stats['p50_ms']} ms  "
+              f"p95 {stats['p95_ms']} ms  p99 {stats['p99_ms']} ms")
+    print(f"\n📊 {report['requests_per_sec']:,} req/dtk, {report['errors']} error")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"✅ Hasil disimpan: '{args.output}'")
+    return 1 if report['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+📏 Pipeline Metrics - Stage Timing and Memory Instrumentation
+Collects per-stage wall time, per-file parse time, rows/sec and tracemalloc
+peaks for UMKMDataProcessor and run_all, and writes them as JSON
+"""
+
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+class PipelineMetrics:
+    """Collects stage and file measurements for one pipeline run
+
+    Stages may nest (save_json_data builds views internally); each stage
+    reports ``peak_mb``, how far the traced memory rose above its level at
+    the start of the stage, including its nested stages. Memory allocated by
+    earlier stages and still held is therefore not counted again.
+    """
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = []
+        self.files = []
+        self._peak_stack = []
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Measure a block; yields a record dict callers may add 'rows' to"""
+        record = {'stage': name, 'seconds': None, 'peak_mb': None, 'rows': None}
+
+        if self.track_memory:
+            # Fold the parent's peak so far into its running max before resetting
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peak_stack:
+                self._peak_stack[-1][1] = max(self._peak_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._peak_stack.append([current, 0])
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 6)
+
+            if self.track_memory:
+                baseline, peak = self._peak_stack.pop()
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record['peak_mb'] = round((peak - baseline) / 1024 ** 2, 3)
+                if self._peak_stack:
+                    self._peak_stack[-1][1] = max(self._peak_stack[-1][1], peak)
+                tracemalloc.reset_peak()
+
+            if record['rows'] is not None and record['seconds'] > 0:
+                record['rows_per_sec'] = round(record['rows'] / record['seconds'], 1)
+            self.stages.append(record)
+
+    def record_file(self, file_name, seconds, rows, cached=False):
+        """Record the parse time of a single input file"""
+        self.files.append({
+            'file': file_name,
+            'seconds': None if seconds is None else round(seconds, 6),
+            'rows': rows,
+            'cached': cached
+        })
+
+    def to_dict(self):
+        """All measurements as a JSON-serialisable dict"""
+        return {
+            'run': {
+                'started': self.started.isoformat(),
+                'total_seconds': round(time.perf_counter() - self._start, 6),
+                'track_memory': self.track_memory
+            },
+            'stages': self.stages,
+            'files': self.files
+        }
+
+    def write_json(self, path):
+        """Write measurements to ``path`` as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def close(self):
+        """Stop tracemalloc if it was started for this run"""
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+def instrumented(name, rows=None):
+    """Method decorator measuring a stage on ``self.metrics`` when it is set
+
+    ``rows`` is an optional callable taking ``self`` and returning the number
+    of rows the stage handled, used for rows/sec.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, 'metrics', None)
+            if metrics is None:
+                return method(self, *args, **kwargs)
+
+            with metrics.stage(name) as record:
+                result = method(self, *args, **kwargs)
+                if rows is not None:
+                    record['rows'] = rows(self)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,40 @@
+"""
+📦 Plotly Bundle - Self-hosted Plotly.js for Static Pages
+Writes a content-hashed copy of the full Plotly.js bundle next to the
+generated HTML, so the static dashboard and batch-exported maps load Plotly.js
+without a CDN
+"""
+
+import os
+from pathlib import Path
+
+import plotly
+import plotly.offline as pyo
+
+from content_hash import write_asset
+
+# Bundle file to ship instead of the full one (must contain every trace type
+# the pages draw: scattermapbox, bar and pie)
+BUNDLE_ENV = 'PLOTLY_BUNDLE'
+
+BUNDLE_PREFIX = 'plotly-'
+
+def bundle_source(bundle=None):
+    """Return (name, JavaScript bytes) of the Plotly.js bundle to ship
+
+    Uses ``bundle`` or the file named by $PLOTLY_BUNDLE when given; otherwise
+    the full plotly.min.js that ships with the plotly Python package,
+    matching its figure JSON.
+    """
+    bundle = bundle or os.environ.get(BUNDLE_ENV)
+    if bundle:
+        path = Path(bundle)
+        return path.name, path.read_bytes()
+    return f"plotly.min.js (plotly {plotly.__version__})", pyo.get_plotlyjs().encode('utf-8')
+
+def write_bundle(output_dir, bundle=None, subdir='assets'):
+    """Write the Plotly.js bundle as ``<subdir>/plotly-<hash>.min.js`` (see content_hash.write_asset)"""
+    name, content = bundle_source(bundle)
+    src = write_asset(output_dir, BUNDLE_PREFIX, content, suffix='.min.js', subdir=subdir)
+    print(f"📦 Plotly.js bundle: {name} -> {src} ({len(content) / 1024:,.0f} KB)")
+    return src
@@ -5,10 +5,13 @@ Orchestrates the entire UMKM analysis and dashboard process
 
 import os
 import shutil
+import argparse
+import cProfile
 from pathlib import Path
 from datetime import datetime
 from umkm_data_processor import UMKMDataProcessor
-from dashboard_umkm import UMKMDashboard
+from tile_pyramid import build_tile_pyramid
+from pipeline_metrics import PipelineMetrics
 
 def setup_environment():
     """Set up the project environment"""
@@ -35,27 +38,60 @@ def setup_environment():
     
     return data_dir, output_dir
 
-def process_data(data_dir, output_dir):
-    """Process UMKM data"""
+def process_data(data_dir, output_dir, workers=None, executor='thread', metrics=None, registry=None):
+    """Process UMKM data
+    
+    A row-level ``registry`` CSV is loaded next to the aggregate CSVs; its
+    kecamatan comes from the lon/lat spatial join when boundary polygons exist.
+    """
     print("\n🔄 PROCESSING UMKM DATA")
     print("=" * 50)
     
     processor = UMKMDataProcessor(
         data_folder=str(data_dir),
-        output_folder=str(output_dir)
+        output_folder=str(output_dir),
+        metrics=metrics
     )
     
     success = False
-    if processor.load_csv_files():
+    loaded = processor.load_csv_files(workers=workers, executor=executor)
+    if registry is not None:
+        boundaries = data_dir / 'tangsel_kecamatan_boundaries.geojson'
+        loaded = processor.load_registry(registry, boundaries=boundaries if boundaries.exists() else None) or loaded
+    if loaded:
         if processor.process_data():
             # Save both Excel and JSON outputs
             processor.save_excel_analysis()
             processor.save_json_data()
+            processor.save_columnar_data()
             processor.print_summary()
             success = True
     
     return success
 
+def prepare_boundaries(data_dir, output_dir):
+    """Simplify kecamatan polygons for the choropleth map, if the source exists"""
+    source = data_dir / 'tangsel_kecamatan_boundaries.geojson'
+    if not source.exists():
+        print("ℹ️  Poligon batas kecamatan tidak ada, peta memakai marker per kecamatan")
+        return None
+    
+    # shapely is only loaded when there are polygons to simplify
+    from boundaries import build_boundaries
+    
+    print("\n🧭 PREPARING BOUNDARIES")
+    print("=" * 50)
+    return build_boundaries(source, output_dir / 'boundaries')
+
+def prepare_tiles(registry, output_dir):
+    """Build the point-density tile pyramid from a geocoded registry, if given"""
+    if registry is None:
+        return None
+    
+    print("\n🧱 PREPARING DENSITY TILES")
+    print("=" * 50)
+    return build_tile_pyramid(registry, output_dir / 'tiles')
+
 def launch_dashboard(port=8050):
     """Launch the interactive dashboard"""
     print("\n🚀 LAUNCHING DASHBOARD")
@@ -63,23 +99,75 @@ def launch_dashboard(port=8050):
     print(f"Dashboard will be available at: http://localhost:{port}")
     print("Press Ctrl+C to stop the server")
     
+    from dashboard_umkm import UMKMDashboard
+    
     dashboard = UMKMDashboard()
     dashboard.run_server(port=port)
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Analisis dan dashboard UMKM Tangerang Selatan')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='tulis waktu per stage, per file, baris/detik dan puncak memori (JSON)')
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help='ukur waktu saja tanpa tracemalloc pada --metrics')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='tulis statistik cProfile (pstats) untuk pemrosesan data')
+    parser.add_argument('--no-dashboard', action='store_true',
+                        help='proses data tanpa menjalankan dashboard')
+    parser.add_argument('--registry', metavar='PATH', type=Path,
+                        help='CSV registri per usaha (kolom lon/lat) untuk spatial join dan tile kepadatan')
+    return parser.parse_args(argv)
+
+def write_diagnostics(args, metrics, profiler):
+    """Write metrics JSON and pstats file if they were requested"""
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"🧪 Profil cProfile disimpan: '{args.profile}'")
+    if metrics is not None:
+        metrics.write_json(args.metrics)
+        metrics.close()
+        print(f"📏 Metrik pipeline disimpan: '{args.metrics}'")
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
+    metrics = PipelineMetrics(track_memory=not args.no_tracemalloc) if args.metrics else None
+    profiler = cProfile.Profile() if args.profile else None
+    
     print("\n🎯 UMKM TANGERANG SELATAN ANALYSIS")
     print("=" * 50)
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
+        if profiler is not None:
+            profiler.enable()
+        
         # Step 1: Setup
-        data_dir, output_dir = setup_environment()
+        if metrics is not None:
+            with metrics.stage('setup_environment'):
+                data_dir, output_dir = setup_environment()
+        else:
+            data_dir, output_dir = setup_environment()
         
         # Step 2: Process Data
-        if process_data(data_dir, output_dir):
+        workers = int(os.environ.get('INGEST_WORKERS', '1'))
+        executor = os.environ.get('INGEST_EXECUTOR', 'thread')
+        success = process_data(data_dir, output_dir, workers=workers, executor=executor, metrics=metrics,
+                               registry=args.registry)
+        if success:
+            prepare_boundaries(data_dir, output_dir)
+            prepare_tiles(args.registry, output_dir)
+        
+        # Diagnostics cover the pipeline run, not the lifetime of the server
+        write_diagnostics(args, metrics, profiler)
+        metrics = profiler = None
+        
+        if success:
             # Step 3: Launch Dashboard
-            launch_dashboard()
+            if not args.no_dashboard:
+                launch_dashboard()
         else:
             print("\n❌ Data processing failed. Dashboard cannot be launched.")
             
@@ -88,6 +176,7 @@ def main():
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
     finally:
+        write_diagnostics(args, metrics, profiler)
         print(f"\n✨ Process completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 if __name__ == "__main__":
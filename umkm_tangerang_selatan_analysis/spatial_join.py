@@ -0,0 +1,94 @@
+"""
+📍 Spatial Join - Point-in-Polygon Assignment
+Assigns geocoded business locations to kecamatan (or kelurahan) polygons
+through an STRtree spatial index built once per boundary file
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from boundaries import read_boundaries
+
+# Points tested per STRtree query, bounding the temporary arrays
+BATCH_SIZE = 500_000
+
+class BoundaryIndex:
+    """STRtree over the polygons of one boundary GeoJSON file"""
+
+    def __init__(self, names, polygons):
+        self.names = np.asarray(names, dtype=object)
+        self.polygons = polygons
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(*read_boundaries(path))
+
+    def locate(self, lon, lat, batch_size=BATCH_SIZE):
+        """Polygon position per point, -1 where no polygon contains it
+
+        Points on a shared border go to the first polygon in file order;
+        missing or non-numeric coordinates are unmatched.
+        """
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        positions = np.full(len(lon), -1, dtype=np.int64)
+
+        for start in range(0, len(lon), batch_size):
+            x, y = lon[start:start + batch_size], lat[start:start + batch_size]
+
+            # Bounding-box candidates from the tree, then an exact test against
+            # the prepared polygon (a query predicate would prepare the points)
+            point_idx, polygon_idx = self.tree.query(shapely.points(x, y))
+            hit = shapely.intersects_xy(self.polygons[polygon_idx], x[point_idx], y[point_idx])
+            point_idx, polygon_idx = point_idx[hit], polygon_idx[hit]
+
+            # First match per point, by polygon position
+            order = np.lexsort((polygon_idx, point_idx))
+            point_idx, polygon_idx = point_idx[order], polygon_idx[order]
+            first = np.unique(point_idx, return_index=True)[1]
+            positions[start + point_idx[first]] = polygon_idx[first]
+        return positions
+
+    def assign(self, lon, lat, batch_size=BATCH_SIZE):
+        """Return (names, stats): polygon name per point (None if unmatched)
+
+        ``stats`` holds the point, matched and unmatched counts, the elapsed
+        seconds and the throughput in points per second.
+        """
+        start = time.perf_counter()
+        positions = self.locate(lon, lat, batch_size)
+        seconds = time.perf_counter() - start
+
+        matched = positions >= 0
+        names = np.full(len(positions), None, dtype=object)
+        names[matched] = self.names[positions[matched]]
+
+        stats = {
+            'points': len(positions),
+            'matched': int(matched.sum()),
+            'unmatched': int((~matched).sum()),
+            'seconds': round(seconds, 3),
+            'points_per_sec': round(len(positions) / seconds) if seconds > 0 else None
+        }
+        return names, stats
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_boundary_index(path):
+    """Process-wide BoundaryIndex for ``path``, rebuilt when the file changes"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, BoundaryIndex.from_file(path))
+            _indexes[path] = cached
+        return cached[1]
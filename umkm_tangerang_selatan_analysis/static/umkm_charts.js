@@ -0,0 +1,78 @@
+/*
+ * 📈 UMKM Static Dashboard - Browser-side Chart Rendering
+ * Builds every chart from the compact data blob embedded in the page
+ * (<script id="umkm-data">) and renders it only when it scrolls into view.
+ */
+
+(function () {
+    const blob = JSON.parse(document.getElementById('umkm-data').textContent);
+    const fmt = value => value.toLocaleString('en-US');
+
+    // Fill the data arrays of a chart's trace skeleton from the data blob
+    const fillers = {
+        geomap: function (trace, data) {
+            // Districts joined to ringkasan_kecamatan, in GeoJSON order (see geomap_builder)
+            const rows = {};
+            data.kecamatan.Kecamatan.forEach((name, i) => { rows[name] = i; });
+            const points = data.districts.name
+                .map((name, i) => ({name: name, lon: data.districts.lon[i], lat: data.districts.lat[i], row: rows[name]}))
+                .filter(point => point.row !== undefined);
+            const column = name => points.map(point => data.kecamatan[name][point.row]);
+            const total = column('Total');
+            const m = data.marker;
+
+            trace.lon = points.map(point => point.lon);
+            trace.lat = points.map(point => point.lat);
+            trace.customdata = points.map(point => point.name);
+            trace.text = points.map((point, i) => '<b>' + point.name + '</b><br>' +
+                'Total UMKM: ' + fmt(total[i]) + '<br>' +
+                'Mikro: ' + fmt(column('Mikro')[i]) + '<br>' +
+                'Kecil: ' + fmt(column('Kecil')[i]));
+            trace.marker.size = total.map(t => Math.min(m.size_max, Math.max(m.size_min, Math.sqrt(t) * m.size_scale)));
+            trace.marker.color = total;
+            return trace;
+        },
+
+        district_chart: function (trace, data) {
+            trace.x = data.kecamatan.Kecamatan;
+            trace.y = data.kecamatan.Total;
+            trace.marker.color = data.kecamatan.Total;
+            return trace;
+        },
+
+        business_type_chart: function (trace, data) {
+            trace.labels = data.bidang.Bidang;
+            trace.values = data.bidang.Total;
+            return trace;
+        }
+    };
+
+    function render(div) {
+        const name = div.dataset.chart;
+        const chart = blob.charts[name];
+        const traces = chart.traces.map(skeleton => fillers[name](JSON.parse(JSON.stringify(skeleton)), blob.data));
+        const layout = Object.assign({template: blob.template}, chart.layout);
+        Plotly.newPlot(div, traces, layout, blob.config);
+        div.dataset.rendered = 'true';
+    }
+
+    const charts = Array.from(document.querySelectorAll('[data-chart]'));
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    render(entry.target);
+                }
+            });
+        }, {rootMargin: '200px'});
+        charts.forEach(div => observer.observe(div));
+    } else {
+        charts.forEach(render);
+    }
+
+    // Make rendered charts responsive
+    window.addEventListener('resize', function () {
+        document.querySelectorAll('[data-rendered="true"]').forEach(div => Plotly.Plots.resize(div));
+    });
+})();
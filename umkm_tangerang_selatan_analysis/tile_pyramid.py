@@ -0,0 +1,242 @@
+"""
+🧱 Tile Pyramid - Precomputed Point-density Grid
+Aggregates geocoded business points into square grid cells at several zoom
+levels and writes them as web-map tiles (tiles/{z}/{x}/{y}.json), so a map
+loads only the cells in its viewport instead of every raw point
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+OUTPUT_DIR = 'data_output/tiles'
+INDEX_NAME = 'index.json'
+
+# Web-map zoom levels with a precomputed grid; a map at zoom m draws the
+# highest level <= m. Tangerang Selatan spans one or two tiles at zoom 10.
+ZOOMS = (10, 12, 14, 16)
+
+# Cells per tile side: 8 px cells when the map zoom equals the tile zoom
+GRID = 32
+
+# Web Mercator latitude limit
+MAX_LAT = 85.05112878
+
+def cell_coordinates(lon, lat, zoom, grid=GRID):
+    """Global (column, row) of the grid cell containing each point at ``zoom``"""
+    n = (1 << zoom) * grid
+    lat = np.radians(np.clip(lat, -MAX_LAT, MAX_LAT))
+    x = (np.asarray(lon) + 180.0) / 360.0 * n
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0 * n
+    return np.clip(x.astype(np.int64), 0, n - 1), np.clip(y.astype(np.int64), 0, n - 1)
+
+def cell_centres(column, row, zoom, grid=GRID):
+    """(lon, lat) of the centre of global grid cells at ``zoom``"""
+    n = (1 << zoom) * grid
+    lon = (column + 0.5) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * (row + 0.5) / n))))
+    return lon, lat
+
+class TilePyramidBuilder:
+    """Accumulates point counts per grid cell for every zoom level
+
+    Memory grows with the number of occupied cells, not with the number of
+    points, so points can be added chunk by chunk.
+    """
+
+    def __init__(self, zooms=ZOOMS, grid=GRID):
+        self.zooms = tuple(zooms)
+        self.grid = grid
+        self.counts = {zoom: pd.Series(dtype=np.int64) for zoom in self.zooms}
+        self.points = 0
+        self.skipped = 0
+        self.bounds = None
+
+    def add(self, lon, lat):
+        """Count one batch of points; missing coordinates are skipped"""
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        valid = np.isfinite(lon) & np.isfinite(lat) & (np.abs(lat) <= MAX_LAT) & (np.abs(lon) <= 180)
+        self.skipped += int((~valid).sum())
+        lon, lat = lon[valid], lat[valid]
+        if not len(lon):
+            return
+        self.points += len(lon)
+
+        batch = [lon.min(), lat.min(), lon.max(), lat.max()]
+        self.bounds = batch if self.bounds is None else [
+            min(self.bounds[0], batch[0]), min(self.bounds[1], batch[1]),
+            max(self.bounds[2], batch[2]), max(self.bounds[3], batch[3])
+        ]
+
+        for zoom in self.zooms:
+            column, row = cell_coordinates(lon, lat, zoom, self.grid)
+            keys, counts = np.unique(column * ((1 << zoom) * self.grid) + row, return_counts=True)
+            self.counts[zoom] = self.counts[zoom].add(pd.Series(counts, index=keys), fill_value=0)
+
+    def tiles(self, zoom):
+        """Yield (x, y, cells) per tile at ``zoom``, cells as column lists"""
+        n = (1 << zoom) * self.grid
+        counts = self.counts[zoom]
+        keys = counts.index.to_numpy(dtype=np.int64)
+        column, row = keys // n, keys % n
+        lon, lat = cell_centres(column, row, zoom, self.grid)
+
+        cells = pd.DataFrame({
+            'x': column // self.grid, 'y': row // self.grid,
+            'lon': lon.round(6), 'lat': lat.round(6), 'count': counts.to_numpy(dtype=np.int64)
+        })
+        for (x, y), tile in cells.groupby(['x', 'y'], sort=True):
+            yield int(x), int(y), {
+                'lon': tile['lon'].tolist(),
+                'lat': tile['lat'].tolist(),
+                'count': tile['count'].tolist()
+            }
+
+    def write(self, output_dir, source_sha256=None):
+        """Write every tile and index.json, replacing ``output_dir`` as a whole"""
+        output_dir = Path(output_dir)
+        tmp_dir = output_dir.with_name(f"{output_dir.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        index = {
+            'source_sha256': source_sha256,
+            'zooms': list(self.zooms),
+            'grid': self.grid,
+            'points': self.points,
+            'skipped': self.skipped,
+            'bounds': [round(float(value), 6) for value in self.bounds] if self.bounds else None,
+            'max_count': {},
+            'tiles': {}
+        }
+        for zoom in self.zooms:
+            names = []
+            for x, y, cells in self.tiles(zoom):
+                path = tmp_dir / str(zoom) / str(x) / f"{y}.json"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(cells, separators=(',', ':')), encoding='utf-8')
+                names.append(f"{x}/{y}")
+            index['tiles'][str(zoom)] = names
+            index['max_count'][str(zoom)] = int(self.counts[zoom].max()) if len(self.counts[zoom]) else 0
+
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        (tmp_dir / INDEX_NAME).write_text(json.dumps(index, indent=2), encoding='utf-8')
+
+        # Swap directories so readers never see a half-written pyramid
+        old_dir = output_dir.with_name(f"{output_dir.name}.old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if output_dir.exists():
+            output_dir.rename(old_dir)
+        tmp_dir.rename(output_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        return index
+
+def load_tile_index(output_dir=OUTPUT_DIR):
+    """index.json of a written pyramid, or None"""
+    try:
+        with open(Path(output_dir) / INDEX_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_tile_pyramid(source, output_dir=OUTPUT_DIR, lon_col='lon', lat_col='lat', sep=',',
+                       chunksize=200_000, zooms=ZOOMS, grid=GRID, force=False):
+    """Stream ``lon_col``/``lat_col`` from a registry CSV into a tile pyramid
+
+    Skipped when the pyramid was already built from this exact file with
+    the same zoom levels and grid. Returns the pyramid index.
+    """
+    h = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    current = load_tile_index(output_dir)
+    if (not force and current and current['source_sha256'] == digest
+            and current['zooms'] == list(zooms) and current['grid'] == grid):
+        print(f"✅ Tile pyramid sudah terbaru ({current['points']:,} titik)")
+        return current
+
+    builder = TilePyramidBuilder(zooms, grid)
+    reader = pd.read_csv(source, sep=sep, usecols=[lon_col, lat_col], dtype=str,
+                         encoding='utf-8-sig', chunksize=chunksize)
+    for chunk in reader:
+        builder.add(pd.to_numeric(chunk[lon_col], errors='coerce'), pd.to_numeric(chunk[lat_col], errors='coerce'))
+
+    index = builder.write(output_dir, source_sha256=digest)
+    print(f"🧱 Tile pyramid: {index['points']:,} titik ({index['skipped']:,} tanpa koordinat valid) -> '{output_dir}'")
+    for zoom in index['zooms']:
+        print(f"   ✅ zoom {zoom:<2} {len(index['tiles'][str(zoom)]):>5} tile, "
+              f"{len(builder.counts[zoom]):>8,} sel, maks {index['max_count'][str(zoom)]:,} titik/sel")
+    return index
+
+def pyramid_zoom(index, zoom):
+    """Highest pyramid level at or below the map ``zoom`` (the lowest if none)"""
+    levels = [level for level in index['zooms'] if level <= zoom]
+    return max(levels) if levels else min(index['zooms'])
+
+def viewport_tiles(index, west, south, east, north, zoom):
+    """(pyramid zoom, [(x, y), ...]) of the existing tiles covering a viewport"""
+    level = pyramid_zoom(index, zoom)
+    grid = index['grid']
+    columns, rows = cell_coordinates(np.array([west, east]), np.array([north, south]), level, grid)
+    x0, x1 = columns // grid
+    y0, y1 = rows // grid
+
+    tiles = []
+    for name in index['tiles'].get(str(level), ()):
+        x, y = map(int, name.split('/'))
+        if x0 <= x <= x1 and y0 <= y <= y1:
+            tiles.append((x, y))
+    return level, tiles
+
+@functools.lru_cache(maxsize=512)
+def read_tile(output_dir, version, zoom, x, y):
+    """Cells of one tile; ``version`` (the source hash) keys the cache"""
+    with open(Path(output_dir) / str(zoom) / str(x) / f"{y}.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def viewport_cells(output_dir, index, west, south, east, north, zoom):
+    """Cells of every tile in a viewport, with the pyramid zoom and its max count"""
+    level, tiles = viewport_tiles(index, west, south, east, north, zoom)
+    cells = {'zoom': level, 'max_count': index['max_count'][str(level)], 'lon': [], 'lat': [], 'count': []}
+    for x, y in tiles:
+        tile = read_tile(str(output_dir), index['source_sha256'], level, x, y)
+        for key in ('lon', 'lat', 'count'):
+            cells[key].extend(tile[key])
+    return cells
+
+def viewport_bounds(center, zoom, width=1200, height=600):
+    """(west, south, east, north) of a map of ``width`` x ``height`` pixels"""
+    degrees_per_pixel = 360.0 / (256 * 2 ** zoom)
+    half_width = width / 2 * degrees_per_pixel
+    half_height = height / 2 * degrees_per_pixel * math.cos(math.radians(center['lat']))
+    return (center['lon'] - half_width, center['lat'] - half_height,
+            center['lon'] + half_width, center['lat'] + half_height)
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Bangun tile pyramid kepadatan titik usaha dari registri')
+    parser.add_argument('source', help='CSV registri dengan kolom koordinat')
+    parser.add_argument('--output', default=OUTPUT_DIR, help='folder output')
+    parser.add_argument('--lon-col', default='lon', help='kolom bujur')
+    parser.add_argument('--lat-col', default='lat', help='kolom lintang')
+    parser.add_argument('--sep', default=',', help='pemisah kolom CSV')
+    parser.add_argument('--force', action='store_true', help='bangun ulang walau sumber tidak berubah')
+    args = parser.parse_args(argv)
+
+    build_tile_pyramid(args.source, args.output, args.lon_col, args.lat_col, sep=args.sep, force=args.force)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
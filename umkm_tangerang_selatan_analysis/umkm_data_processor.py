@@ -4,16 +4,399 @@ Processes UMKM data from multiple CSV files and creates comprehensive analysis
 """
 
 import pandas as pd
+import numpy as np
 import os
 import json
+import hashlib
+import re
+import time
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from umkm_payload import build_payload, write_payload
+from pipeline_metrics import instrumented
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+TAHUN_PATTERN = re.compile(r'\bTahun\s+(\d{4})\b', re.IGNORECASE)
+
+STEM_TAHUN_PATTERN = re.compile(r'^(?P<bidang>.+?)[ _-](?P<tahun>\d{4})$')
+
+def split_bidang_tahun(stem):
+    """Split a file stem like "Kuliner_2024" into ("Kuliner", 2024)"""
+    match = STEM_TAHUN_PATTERN.match(stem)
+    if match:
+        return match.group('bidang'), int(match.group('tahun'))
+    return stem, None
+
+def parse_tahun(file_path):
+    """Return the year from a CSV title row ("... Tahun 2023"), or None"""
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for _, line in zip(range(2), f):
+            match = TAHUN_PATTERN.search(line)
+            if match:
+                return int(match.group(1))
+    return None
+
+def parse_csv_file(file_path, kecamatan_list):
+    """Parse and clean a single UMKM CSV file
+    
+    Returns the cleaned DataFrame and the number of unrecognised districts.
+    ``Tahun`` comes from the title row, falling back to a year suffix in the
+    file name (``Kuliner_2024.csv``). Defined at module level so it can be
+    shipped to a process pool.
+    """
+    file_path = Path(file_path)
+    bidang, tahun_file = split_bidang_tahun(file_path.stem)
+    tahun = parse_tahun(file_path) or tahun_file
+    
+    # Enhanced CSV reading with better error handling
+    df = pd.read_csv(
+        file_path, 
+        skiprows=2, 
+        sep=';', 
+        encoding='utf-8-sig', 
+        names=['Kecamatan', 'Mikro', 'Kecil']
+    )
+    
+    # Data cleaning
+    df = df.dropna(subset=['Kecamatan'])
+    df = df[df['Kecamatan'].str.lower() != 'kecamatan']
+    df['Kecamatan'] = df['Kecamatan'].str.strip()
+    
+    # Convert to numeric with better error handling
+    df['Mikro'] = pd.to_numeric(df['Mikro'], errors='coerce').fillna(0).astype(int)
+    df['Kecil'] = pd.to_numeric(df['Kecil'], errors='coerce').fillna(0).astype(int)
+    
+    # Add calculated columns
+    df['Bidang'] = bidang
+    df['Total'] = df['Mikro'] + df['Kecil']
+    df['Tahun'] = pd.array([tahun] * len(df), dtype='Int64')
+    
+    # Validate districts
+    invalid_count = int((~df['Kecamatan'].isin(kecamatan_list)).sum())
+    
+    return df, invalid_count
+
+def timed_parse_csv_file(file_path, kecamatan_list):
+    """parse_csv_file plus the seconds it took, measured where it ran"""
+    start = time.perf_counter()
+    result = parse_csv_file(file_path, kecamatan_list)
+    return result, time.perf_counter() - start
+
+def _processed_rows(processor):
+    """Row count of processed_data for stage metrics"""
+    return 0 if processor.processed_data is None else len(processor.processed_data)
+
+def _records(df):
+    """DataFrame records with NaN replaced by None so they serialise to JSON"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def write_excel_streaming(path, sheets, number_format=None, chunksize=50_000):
+    """Write [(sheet_name, DataFrame), ...] with a write-only openpyxl workbook
+    
+    Rows are appended in chunks and flushed to disk as they are written, so
+    the workbook is never held in memory. Returns seconds spent per sheet.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+    
+    workbook = Workbook(write_only=True)
+    timings = {}
+    
+    for sheet_name, df in sheets:
+        start = time.perf_counter()
+        sheet = workbook.create_sheet(sheet_name)
+        numeric = [pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes]
+        
+        # Column widths must be set before the first row in write-only mode
+        for i, column in enumerate(df.columns, start=1):
+            sheet.column_dimensions[get_column_letter(i)].width = max(len(str(column)) + 2, 12)
+        
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(sheet, value=str(column))
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+        
+        for offset in range(0, len(df), chunksize):
+            rows = df.iloc[offset:offset + chunksize].itertuples(index=False, name=None)
+            if number_format is None:
+                for row in rows:
+                    sheet.append(row)
+                continue
+            
+            for row in rows:
+                cells = []
+                for value, is_numeric in zip(row, numeric):
+                    if is_numeric:
+                        value = WriteOnlyCell(sheet, value=value)
+                        value.number_format = number_format
+                    cells.append(value)
+                sheet.append(cells)
+        
+        timings[sheet_name] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    workbook.save(path)
+    timings['(simpan)'] = time.perf_counter() - start
+    return timings
+
+class IngestCache:
+    """On-disk cache of parsed CSV frames keyed by file name and content hash
+    
+    The manifest records size, mtime and sha256 per file. A file whose size
+    and mtime are unchanged is trusted without re-hashing; otherwise it is
+    hashed and only re-parsed when the content actually changed. Frames are
+    stored per file name too, since ``Bidang`` and ``Tahun`` may come from
+    the name: identical exports under two names keep separate frames.
+    """
+    
+    VERSION = 3
+    
+    def __init__(self, cache_folder, kecamatan_list):
+        self.cache_folder = Path(cache_folder)
+        self.frames_folder = self.cache_folder / 'frames'
+        self.manifest_path = self.cache_folder / 'manifest.json'
+        self.frames_folder.mkdir(parents=True, exist_ok=True)
+        
+        # Cached results depend on the parser and the district list
+        self.signature = {'version': self.VERSION, 'kecamatan_list': list(kecamatan_list)}
+        self.entries = self._read_manifest()
+        self._digests = {}
+        
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if manifest.get('signature') != self.signature:
+            return {}
+        return manifest.get('files', {})
+    
+    @staticmethod
+    def file_digest(file_path):
+        """Return the sha256 hex digest of a file's content"""
+        h = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        return h.hexdigest()
+    
+    def _digest(self, file_path, stat):
+        entry = self.entries.get(file_path.name)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        if file_path not in self._digests:
+            self._digests[file_path] = self.file_digest(file_path)
+        return self._digests[file_path]
+    
+    @staticmethod
+    def frame_name(file_name, digest):
+        """Pickle file name for one (file name, content) pair"""
+        name_digest = hashlib.sha256(file_name.encode('utf-8')).hexdigest()[:16]
+        return f"{digest}-{name_digest}.pkl"
+    
+    def lookup(self, file_path):
+        """Return the cached (DataFrame, invalid_count) or None on a miss"""
+        entry = self.entries.get(file_path.name)
+        if entry is None:
+            return None
+        
+        stat = file_path.stat()
+        if entry['size'] != stat.st_size or self._digest(file_path, stat) != entry['sha256']:
+            return None
+        
+        try:
+            df = pd.read_pickle(self.frames_folder / entry['frame'])
+        except (OSError, ValueError, EOFError):
+            return None
+        
+        # Content is unchanged; remember the new mtime so the next run skips hashing
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return df, entry['invalid_count']
+    
+    def store(self, file_path, result):
+        """Store a freshly parsed result for file_path"""
+        df, invalid_count = result
+        stat = file_path.stat()
+        digest = self._digest(file_path, stat)
+        
+        frame = self.frame_name(file_path.name, digest)
+        df.to_pickle(self.frames_folder / frame)
+        self.entries[file_path.name] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'frame': frame,
+            'invalid_count': invalid_count
+        }
+        
+    def save(self, file_names):
+        """Write the manifest, dropping entries and frames for removed files"""
+        self.entries = {name: entry for name, entry in self.entries.items() if name in file_names}
+        
+        live_frames = {entry['frame'] for entry in self.entries.values()}
+        for frame_path in self.frames_folder.glob('*.pkl'):
+            if frame_path.name not in live_frames:
+                frame_path.unlink()
+        
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'files': self.entries}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._digests = {}
+
+class UMKMCube:
+    """Dense int32 cube of UMKM counts over (kecamatan, bidang, skala)
+    
+    ``kecamatan`` and ``bidang`` are sorted category indexes for the first two
+    axes; the last axis follows ``SKALA``. ``first_row`` holds the position of
+    the first source row of every cell (-1 if the combination never occurs),
+    which doubles as the presence mask and the tie-breaker for top-N queries.
+    """
+    
+    SKALA = ('Mikro', 'Kecil')
+    
+    def __init__(self, values, kecamatan, bidang, first_row):
+        self.values = values
+        self.kecamatan = kecamatan
+        self.bidang = bidang
+        self.first_row = first_row
+        self.kecamatan_index = {name: i for i, name in enumerate(kecamatan)}
+        self.bidang_index = {name: i for i, name in enumerate(bidang)}
+    
+    @classmethod
+    def from_frame(cls, df):
+        """Build a cube from long-format data with Kecamatan/Bidang/Mikro/Kecil
+        
+        Rows without a Kecamatan or Bidang cannot be placed in the cube; they
+        are counted and reported with a warning instead of dropped silently.
+        """
+        kec_codes, kecamatan = pd.factorize(df['Kecamatan'], sort=True)
+        bid_codes, bidang = pd.factorize(df['Bidang'], sort=True)
+        n_kec, n_bid = len(kecamatan), len(bidang)
+        
+        valid = (kec_codes >= 0) & (bid_codes >= 0)
+        dropped = int((~valid).sum())
+        if dropped:
+            lost = int(df[list(cls.SKALA)].to_numpy()[~valid].sum())
+            print(f"⚠️  {dropped:,} baris tanpa Kecamatan/Bidang diabaikan ({lost:,} UMKM tidak terhitung)")
+        
+        rows = np.flatnonzero(valid)
+        flat = kec_codes[valid] * n_bid + bid_codes[valid]
+        
+        values = np.empty((n_kec, n_bid, len(cls.SKALA)), dtype=np.int32)
+        for i, skala in enumerate(cls.SKALA):
+            weights = df[skala].to_numpy()[valid]
+            values[:, :, i] = np.bincount(flat, weights=weights, minlength=n_kec * n_bid).reshape(n_kec, n_bid)
+        
+        first_row = np.full(n_kec * n_bid, -1, dtype=np.int64)
+        cells, first = np.unique(flat, return_index=True)
+        first_row[cells] = rows[first]
+        
+        return cls(
+            values,
+            kecamatan.rename('Kecamatan'),
+            bidang.rename('Bidang'),
+            first_row.reshape(n_kec, n_bid)
+        )
+    
+    @property
+    def present(self):
+        """Boolean (kecamatan, bidang) mask of combinations that occur in the data"""
+        return self.first_row >= 0
+    
+    def totals(self):
+        """Mikro + Kecil per (kecamatan, bidang) cell"""
+        return self.values.sum(axis=2, dtype=np.int64)
+    
+    def summary(self, axis):
+        """Mikro/Kecil/Total per category along ``axis`` (0 = kecamatan, 1 = bidang)"""
+        other = 1 - axis
+        sums = self.values.sum(axis=other, dtype=np.int64)
+        return pd.DataFrame({
+            self.SKALA[0]: sums[:, 0],
+            self.SKALA[1]: sums[:, 1],
+            'Total': sums.sum(axis=1)
+        })
+    
+    def subset(self, kecamatan=None, bidang=None, skala=None):
+        """Cube restricted to the given categories
+        
+        Empty or None kecamatan/bidang select all of them; ``skala=None``
+        selects both size classes and an empty skala selection none. Unknown
+        names are ignored. Deselected skala are zeroed rather than dropped, so
+        ``summary`` keeps its Mikro/Kecil/Total columns and Total only counts
+        the selected size classes.
+        """
+        kec = self._positions(self.kecamatan, kecamatan)
+        bid = self._positions(self.bidang, bidang)
+        values = self.values[np.ix_(kec, bid)]
+        if skala is not None:
+            values = values * np.isin(self.SKALA, list(skala)).astype(values.dtype)
+        
+        return UMKMCube(values, self.kecamatan[kec], self.bidang[bid], self.first_row[np.ix_(kec, bid)])
+    
+    @staticmethod
+    def _positions(index, names):
+        """Sorted positions of ``names`` in ``index`` (all positions if empty)"""
+        if not names:
+            return np.arange(len(index))
+        positions = index.get_indexer(list(names))
+        return np.sort(positions[positions >= 0])
+    
+    def top_cells(self, n):
+        """Flat indexes of the n largest present cells, ties broken by source order"""
+        totals = np.where(self.present, self.totals(), -np.iinfo(np.int64).max).ravel()
+        n = min(n, int(self.present.sum()))
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        # argpartition narrows to the candidates, then order them exactly
+        kth = totals[np.argpartition(-totals, n - 1)[n - 1]]
+        candidates = np.flatnonzero(totals >= kth)
+        order = np.lexsort((self.first_row.ravel()[candidates], -totals[candidates]))
+        return candidates[order][:n]
 
 class UMKMDataProcessor:
-    def __init__(self, data_folder='data', output_folder='data_output'):
+    COLUMNS = ['Kecamatan', 'Bidang', 'Mikro', 'Kecil', 'Total']
+    
+    # Analysis views, in the order create_analysis_views returns them
+    VIEW_NAMES = (
+        'pivot_kecamatan_bidang',
+        'ringkasan_kecamatan',
+        'ringkasan_bidang',
+        'top_kombinasi',
+        'statistik'
+    )
+    
+    # Year-over-year views across all partitions, only available on request
+    GROWTH_VIEW_NAMES = (
+        'pertumbuhan_kecamatan',
+        'pertumbuhan_bidang',
+        'cagr_kecamatan',
+        'cagr_bidang'
+    )
+    
+    def __init__(self, data_folder='data', output_folder='data_output', use_cache=True, cache_folder=None,
+                 metrics=None):
         self.data_folder = Path(data_folder)
         self.output_folder = Path(output_folder)
         self.output_folder.mkdir(exist_ok=True)
+        self.use_cache = use_cache
+        self.cache_folder = Path(cache_folder) if cache_folder else self.output_folder / '.ingest_cache'
+        
+        # Optional pipeline_metrics.PipelineMetrics collecting stage timings
+        self.metrics = metrics
         
         # Tangerang Selatan districts
         self.kecamatan_list = [
@@ -22,133 +405,486 @@ class UMKMDataProcessor:
         ]
         
         self.all_data = []
+        self.partitions = {}
+        self.tahun = None
+        self.tahun_bidang = {}
+        self.registry_rows = 0
+        self.spatial_join_stats = None
         self.processed_data = None
         
-    def load_csv_files(self):
-        """Load and process all CSV files from data folder"""
+    @instrumented('load_csv_files', rows=lambda self: sum(len(df) for df in self.all_data))
+    def load_csv_files(self, workers=None, executor='thread'):
+        """Load and process all CSV files from data folder
+        
+        With ``workers`` > 1 the files are parsed on a thread pool
+        (``executor='thread'``) or process pool (``executor='process'``).
+        Results are always merged and reported in sorted file order.
+        """
         print("🔄 Memulai proses penggabungan data UMKM Tangerang Selatan...")
         print("=" * 60)
         
-        csv_files = list(self.data_folder.glob('*.csv'))
+        csv_files = sorted(self.data_folder.glob('*.csv'))
         
         if not csv_files:
             print(f"❌ Tidak ada file CSV ditemukan di folder {self.data_folder}")
             return False
             
-        for file_path in csv_files:
-            bidang = file_path.stem
-            
-            try:
-                # Enhanced CSV reading with better error handling
-                df = pd.read_csv(
-                    file_path, 
-                    skiprows=2, 
-                    sep=';', 
-                    encoding='utf-8-sig', 
-                    names=['Kecamatan', 'Mikro', 'Kecil']
-                )
-                
-                # Data cleaning
-                df = df.dropna(subset=['Kecamatan'])
-                df = df[df['Kecamatan'].str.lower() != 'kecamatan']
-                df['Kecamatan'] = df['Kecamatan'].str.strip()
-                
-                # Convert to numeric with better error handling
-                df['Mikro'] = pd.to_numeric(df['Mikro'], errors='coerce').fillna(0).astype(int)
-                df['Kecil'] = pd.to_numeric(df['Kecil'], errors='coerce').fillna(0).astype(int)
-                
-                # Add calculated columns
-                df['Bidang'] = bidang
-                df['Total'] = df['Mikro'] + df['Kecil']
-                
-                # Validate districts
-                valid_districts = df[df['Kecamatan'].isin(self.kecamatan_list)]
-                invalid_districts = df[~df['Kecamatan'].isin(self.kecamatan_list)]
-                
-                if len(invalid_districts) > 0:
-                    print(f"⚠️  {bidang}: {len(invalid_districts)} kecamatan tidak dikenali")
+        for file_path, result, error, seconds in self._parse_files(csv_files, workers, executor):
+            if error is not None:
+                print(f"❌ Error di file {file_path.name}: {error}")
+                continue
                 
-                self.all_data.append(df)
-                print(f"✅ {bidang:<20} → {len(df)} kecamatan, Total UMKM: {df['Total'].sum():,}")
-                
-            except Exception as e:
-                print(f"❌ Error di file {file_path.name}: {e}")
+            df, invalid_count = result
+            # Log the bidang/tahun the rows are grouped under, not the file name
+            if len(df):
+                bidang, tahun = df['Bidang'].iloc[0], df['Tahun'].iloc[0]
+            else:
+                bidang, tahun = split_bidang_tahun(file_path.stem)
+            if not pd.isna(tahun):
+                bidang = f"{bidang} ({tahun})"
+            if self.metrics is not None:
+                self.metrics.record_file(file_path.name, seconds, len(df), cached=seconds is None)
+            if invalid_count > 0:
+                print(f"⚠️  {bidang}: {invalid_count} kecamatan tidak dikenali")
+            
+            self.all_data.append(df)
+            print(f"✅ {bidang:<20} → {len(df)} kecamatan, Total UMKM: {df['Total'].sum():,}")
                 
         return len(self.all_data) > 0
     
+    @instrumented('load_registry', rows=lambda self: self.registry_rows)
+    def load_registry(self, file_path, chunksize=200_000, sep=',', tahun=None,
+                      kecamatan_col='Kecamatan', bidang_col='Bidang', skala_col='Skala',
+                      boundaries=None, lon_col='lon', lat_col='lat'):
+        """Stream a row-level business registry into Mikro/Kecil aggregates
+        
+        The file is read ``chunksize`` rows at a time and every chunk is folded
+        into per (kecamatan, bidang, skala) counts, so memory is bounded by the
+        number of combinations rather than the number of businesses. The
+        result joins ``all_data`` like one parsed CSV file.
+        
+        With ``boundaries`` (a kecamatan polygon GeoJSON) the kecamatan comes
+        from each business's ``lon_col``/``lat_col`` coordinates instead of
+        ``kecamatan_col``, via a spatial index built once per boundary file.
+        Points outside every polygon are counted and skipped.
+        """
+        file_path = Path(file_path)
+        columns = [kecamatan_col, bidang_col, skala_col]
+        counts = None
+        total_rows = 0
+        unknown_skala = 0
+        
+        index = None
+        if boundaries is not None:
+            # shapely is only needed for the spatial join
+            from spatial_join import get_boundary_index
+            index = get_boundary_index(boundaries)
+        usecols = [lon_col, lat_col, bidang_col, skala_col] if index is not None else columns
+        join = {'points': 0, 'matched': 0, 'unmatched': 0, 'seconds': 0.0}
+        
+        try:
+            reader = pd.read_csv(
+                file_path,
+                sep=sep,
+                usecols=usecols,
+                dtype=str,
+                encoding='utf-8-sig',
+                chunksize=chunksize
+            )
+            self.registry_rows = 0
+            for chunk in reader:
+                total_rows += len(chunk)
+                self.registry_rows = total_rows
+                if index is not None:
+                    names, stats = index.assign(
+                        pd.to_numeric(chunk[lon_col], errors='coerce'),
+                        pd.to_numeric(chunk[lat_col], errors='coerce')
+                    )
+                    chunk = chunk.assign(**{kecamatan_col: names})
+                    for key in join:
+                        join[key] += stats[key]
+                chunk_counts, chunk_unknown = self._aggregate_registry_chunk(chunk, *columns)
+                unknown_skala += chunk_unknown
+                counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+        except Exception as e:
+            print(f"❌ Error di file {file_path.name}: {e}")
+            return False
+        
+        if counts is None or counts.empty:
+            print(f"❌ Tidak ada baris usaha valid di {file_path.name}")
+            return False
+        
+        df = counts.unstack(fill_value=0).reindex(columns=list(UMKMCube.SKALA), fill_value=0)
+        df = df.astype(int).reset_index()
+        df.columns = ['Kecamatan', 'Bidang', 'Mikro', 'Kecil']
+        df['Total'] = df['Mikro'] + df['Kecil']
+        df['Tahun'] = pd.array([tahun] * len(df), dtype='Int64')
+        df = df.sort_values(['Bidang', 'Kecamatan'], ignore_index=True)
+        
+        invalid_count = int((~df['Kecamatan'].isin(self.kecamatan_list)).sum())
+        if invalid_count > 0:
+            print(f"⚠️  {file_path.stem}: {invalid_count} kombinasi dengan kecamatan tidak dikenali")
+        if unknown_skala > 0:
+            print(f"⚠️  {file_path.stem}: {unknown_skala:,} baris dengan skala usaha selain Mikro/Kecil diabaikan")
+        if index is not None:
+            join['seconds'] = round(join['seconds'], 3)
+            join['points_per_sec'] = round(join['points'] / join['seconds']) if join['seconds'] > 0 else None
+            self.spatial_join_stats = join
+            print(f"📍 {file_path.stem}: {join['matched']:,} titik masuk kecamatan, "
+                  f"{join['unmatched']:,} di luar batas/tanpa koordinat ({join['points_per_sec'] or 0:,} titik/dtk)")
+        
+        self.all_data.append(df)
+        print(f"✅ {file_path.stem:<20} → {total_rows:,} baris usaha, {len(df)} kombinasi, Total UMKM: {df['Total'].sum():,}")
+        return True
+    
+    @staticmethod
+    def _aggregate_registry_chunk(chunk, kecamatan_col, bidang_col, skala_col):
+        """Count businesses per (kecamatan, bidang, skala) in one chunk"""
+        skala = chunk[skala_col].str.strip().str.title()
+        known = skala.isin(UMKMCube.SKALA)
+        keys = pd.DataFrame({
+            'Kecamatan': chunk[kecamatan_col].str.strip(),
+            'Bidang': chunk[bidang_col].str.strip(),
+            'Skala': skala
+        })[known]
+        return keys.groupby(['Kecamatan', 'Bidang', 'Skala']).size(), int((~known).sum())
+    
+    def _parse_files(self, csv_files, workers=None, executor='thread'):
+        """Yield (file_path, result, error, seconds) for each file in the given order
+        
+        Files whose content is unchanged since the last run are served from
+        the ingestion cache (``seconds`` is None); only new or changed files
+        are parsed.
+        """
+        cache = IngestCache(self.cache_folder, self.kecamatan_list) if self.use_cache else None
+        cached = {}
+        if cache is not None:
+            cached = {file_path: cache.lookup(file_path) for file_path in csv_files}
+        
+        misses = [file_path for file_path in csv_files if cached.get(file_path) is None]
+        if cache is not None:
+            print(f"♻️  Cache: {len(csv_files) - len(misses)} file tidak berubah, {len(misses)} file diproses ulang")
+        parsed = self._parse_uncached(misses, workers, executor)
+        
+        for file_path in csv_files:
+            result = cached.get(file_path)
+            if result is not None:
+                yield file_path, result, None, None
+                continue
+            
+            file_path, result, error, seconds = next(parsed)
+            if cache is not None and error is None:
+                cache.store(file_path, result)
+            yield file_path, result, error, seconds
+        
+        if cache is not None:
+            cache.save({file_path.name for file_path in csv_files})
+    
+    def _parse_uncached(self, csv_files, workers=None, executor='thread'):
+        """Parse files serially or on a pool, yielding in the given order"""
+        if not workers or workers <= 1:
+            for file_path in csv_files:
+                try:
+                    result, seconds = timed_parse_csv_file(file_path, self.kecamatan_list)
+                    yield file_path, result, None, seconds
+                except Exception as e:
+                    yield file_path, None, e, None
+            return
+        
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor harus salah satu dari {sorted(EXECUTORS)}")
+            
+        with EXECUTORS[executor](max_workers=workers) as pool:
+            futures = [
+                (file_path, pool.submit(timed_parse_csv_file, file_path, self.kecamatan_list))
+                for file_path in csv_files
+            ]
+            for file_path, future in futures:
+                try:
+                    result, seconds = future.result()
+                    yield file_path, result, None, seconds
+                except Exception as e:
+                    yield file_path, None, e, None
+    
+    @instrumented('process_data', rows=_processed_rows)
     def process_data(self):
-        """Process and combine all loaded data"""
+        """Process and combine all loaded data
+        
+        Loaded frames are split into year partitions using the year parsed
+        from each file's title row; files without a year stay in their own
+        undated partition (key None). ``processed_data`` takes every bidang
+        from its latest dated partition, or from the undated one if the bidang
+        has no dated file, so one newer file never hides the other sectors.
+        ``tahun_bidang`` records the year used per bidang.
+        """
         if not self.all_data:
             print("❌ Tidak ada data untuk diproses")
             return False
             
         print("\n🔄 Menggabungkan semua data...")
-        self.processed_data = pd.concat(self.all_data, ignore_index=True)
+        self.partitions = self._partition_by_year(self.all_data)
+        self.tahun = max(self.tahun_list) if self.tahun_list else None
+        self.tahun_bidang = self._latest_per_bidang(self.partitions)
         
         # Reorder columns
-        self.processed_data = self.processed_data[['Kecamatan', 'Bidang', 'Mikro', 'Kecil', 'Total']]
+        frames = []
+        for df in self.all_data:
+            tahun = None if not len(df) or pd.isna(df['Tahun'].iloc[0]) else int(df['Tahun'].iloc[0])
+            wanted = [bidang for bidang, latest in self.tahun_bidang.items() if latest == tahun]
+            frames.append(df[df['Bidang'].isin(wanted)])
+        self.processed_data = pd.concat(frames, ignore_index=True)[self.COLUMNS]
         
         print(f"✅ Data berhasil digabung: {len(self.processed_data)} baris")
         print(f"📊 Total UMKM keseluruhan: {self.processed_data['Total'].sum():,}")
+        if self.tahun is not None:
+            tahun_list = ', '.join(str(tahun) for tahun in self.tahun_list)
+            print(f"📅 Tahun data: {tahun_list} (terbaru: {self.tahun})")
+            self._report_mixed_years()
         
         return True
     
+    def _report_mixed_years(self):
+        """Warn about bidang analysed from an older year or from undated files"""
+        older = {bidang: tahun for bidang, tahun in self.tahun_bidang.items()
+                 if tahun is not None and tahun < self.tahun}
+        undated = sorted(bidang for bidang, tahun in self.tahun_bidang.items() if tahun is None)
+        if older:
+            listed = ', '.join(f"{bidang} ({tahun})" for bidang, tahun in sorted(older.items()))
+            print(f"⚠️  {len(older)} bidang belum punya data {self.tahun}, memakai tahun terbarunya: {listed}")
+        if undated:
+            print(f"⚠️  {len(undated)} bidang hanya punya file tanpa tahun: {', '.join(undated)}")
+        
+        undated_rows = self.partitions.get(None)
+        if undated_rows is not None:
+            skipped = sorted(set(undated_rows['Bidang']) - set(undated))
+            if skipped:
+                print(f"⚠️  File tanpa tahun diabaikan untuk bidang yang punya data bertahun: {', '.join(skipped)}")
+    
+    @staticmethod
+    def _partition_by_year(frames):
+        """Group per-file frames into {tahun: DataFrame}, keeping file order
+        
+        Frames without a year are grouped under None.
+        """
+        grouped = {}
+        for df in frames:
+            tahun = df['Tahun'].iloc[0] if len(df) else pd.NA
+            grouped.setdefault(None if pd.isna(tahun) else int(tahun), []).append(df)
+        
+        return {
+            tahun: pd.concat(group, ignore_index=True)
+            for tahun, group in grouped.items()
+        }
+    
+    @staticmethod
+    def _latest_per_bidang(partitions):
+        """{bidang: latest year with data for it}, None if only undated data exists"""
+        latest = {}
+        for tahun, df in partitions.items():
+            for bidang in df['Bidang'].dropna().unique():
+                if bidang not in latest or latest[bidang] is None or (tahun is not None and tahun > latest[bidang]):
+                    latest[bidang] = tahun
+        return latest
+    
+    @property
+    def tahun_list(self):
+        """Sorted years with a partition (undated data is not listed)"""
+        return sorted(tahun for tahun in self.partitions if tahun is not None)
+    
+    @property
+    def processed_data(self):
+        """Combined long-format data; assigning it invalidates cached views"""
+        return self._processed_data
+    
+    @processed_data.setter
+    def processed_data(self, value):
+        self._processed_data = value
+        self.invalidate_views()
+    
+    def invalidate_views(self):
+        """Drop all memoized analysis views"""
+        self._views = {}
+        self._cube = None
+        self._year_cube = None
+    
+    @property
+    def cube(self):
+        """Dense kecamatan × bidang × skala cube backing every analysis view"""
+        if self._cube is None and self.processed_data is not None:
+            self._cube = UMKMCube.from_frame(self.processed_data)
+        return self._cube
+    
+    @property
+    def year_cube(self):
+        """(tahun list, totals) where totals has shape (tahun, kecamatan, bidang)
+        
+        Built in a single bincount over every year partition; kecamatan and
+        bidang axes use the same sorted categories as ``cube``.
+        """
+        if self._year_cube is None and self.tahun_list:
+            data = pd.concat([self.partitions[tahun] for tahun in self.tahun_list], ignore_index=True)
+            year_codes, years = pd.factorize(data['Tahun'], sort=True)
+            kec_codes, kecamatan = pd.factorize(data['Kecamatan'], sort=True)
+            bid_codes, bidang = pd.factorize(data['Bidang'], sort=True)
+            shape = (len(years), len(kecamatan), len(bidang))
+            
+            flat = np.ravel_multi_index((year_codes, kec_codes, bid_codes), shape)
+            totals = np.bincount(flat, weights=data['Total'].to_numpy(), minlength=np.prod(shape))
+            self._year_cube = (
+                [int(tahun) for tahun in years],
+                kecamatan.rename('Kecamatan'),
+                bidang.rename('Bidang'),
+                totals.reshape(shape).astype(np.int64)
+            )
+        return self._year_cube
+    
+    def get_view(self, name):
+        """Return a single analysis view, computing and caching it on first use"""
+        if name not in self.VIEW_NAMES and name not in self.GROWTH_VIEW_NAMES:
+            raise KeyError(f"View tidak dikenal: {name}")
+        if name not in self._views:
+            builder = getattr(self, f'_build_{name}')
+            if self.metrics is None:
+                self._views[name] = builder()
+            else:
+                with self.metrics.stage(f'view:{name}'):
+                    self._views[name] = builder()
+        return self._views[name]
+    
     def create_analysis_views(self):
         """Create various analysis views of the data"""
         if self.processed_data is None:
             print("❌ Data belum diproses")
             return {}
             
-        analysis = {}
+        return {name: self.get_view(name) for name in self.VIEW_NAMES}
+    
+    def _build_pivot_kecamatan_bidang(self):
+        """Pivot table - UMKM per Kecamatan per Bidang"""
+        cube = self.cube
+        return pd.DataFrame(cube.totals(), index=cube.kecamatan, columns=cube.bidang)
+    
+    def _build_ringkasan_kecamatan(self):
+        """Summary per Kecamatan"""
+        cube = self.cube
+        ringkasan = cube.summary(axis=0)
+        ringkasan.insert(0, 'Kecamatan', cube.kecamatan)
+        ringkasan['Jumlah_Bidang'] = cube.present.sum(axis=1)
+        return ringkasan.sort_values('Total', ascending=False)
+    
+    def _build_ringkasan_bidang(self):
+        """Summary per Bidang"""
+        cube = self.cube
+        ringkasan = cube.summary(axis=1)
+        ringkasan.insert(0, 'Bidang', cube.bidang)
+        return ringkasan.sort_values('Total', ascending=False)
+    
+    def _build_top_kombinasi(self):
+        """Top combinations"""
+        cube = self.cube
+        cells = cube.top_cells(10)
+        kec, bid = np.divmod(cells, len(cube.bidang))
+        values = cube.values[kec, bid].astype(np.int64)
+        return pd.DataFrame({
+            'Kecamatan': cube.kecamatan[kec],
+            'Bidang': cube.bidang[bid],
+            'Mikro': values[:, 0],
+            'Kecil': values[:, 1],
+            'Total': values.sum(axis=1)
+        })
+    
+    def _build_statistik(self):
+        """Statistics summary"""
+        cube = self.cube
+        totals = cube.totals()
+        skala = cube.values.sum(axis=(0, 1), dtype=np.int64)
         
-        # 1. Pivot table - UMKM per Kecamatan per Bidang
-        analysis['pivot_kecamatan_bidang'] = self.processed_data.pivot_table(
-            index='Kecamatan', 
-            columns='Bidang', 
-            values='Total', 
-            aggfunc='sum', 
-            fill_value=0
-        )
+        return {
+            'total_umkm': int(skala.sum()),
+            'total_mikro': int(skala[0]),
+            'total_kecil': int(skala[1]),
+            'jumlah_kecamatan': len(cube.kecamatan),
+            'jumlah_bidang': len(cube.bidang),
+            'rata_rata_per_kecamatan': float(totals.sum(axis=1).mean()),
+            'rata_rata_per_bidang': float(totals.sum(axis=0).mean())
+        }
+    
+    def _growth_frames(self, axis):
+        """Year-over-year and CAGR frames along one axis (1 = kecamatan, 2 = bidang)
         
-        # 2. Summary per Kecamatan
-        analysis['ringkasan_kecamatan'] = self.processed_data.groupby('Kecamatan').agg({
-            'Mikro': 'sum',
-            'Kecil': 'sum', 
-            'Total': 'sum'
-        }).reset_index()
-        analysis['ringkasan_kecamatan']['Jumlah_Bidang'] = (
-            self.processed_data.groupby('Kecamatan')['Bidang'].nunique().values
-        )
-        analysis['ringkasan_kecamatan'] = analysis['ringkasan_kecamatan'].sort_values('Total', ascending=False)
-        
-        # 3. Summary per Bidang
-        analysis['ringkasan_bidang'] = self.processed_data.groupby('Bidang').agg({
-            'Mikro': 'sum',
-            'Kecil': 'sum',
-            'Total': 'sum'
-        }).reset_index()
-        analysis['ringkasan_bidang'] = analysis['ringkasan_bidang'].sort_values('Total', ascending=False)
-        
-        # 4. Top combinations
-        analysis['top_kombinasi'] = self.processed_data.nlargest(10, 'Total')[
-            ['Kecamatan', 'Bidang', 'Mikro', 'Kecil', 'Total']
-        ]
+        Year-over-year figures only compare consecutive years; after a gap
+        (e.g. 2021 then 2023) they are NaN and ``Tahun_Sebelumnya`` is empty.
+        Raises ValueError with fewer than two dated years.
+        """
+        if self.year_cube is None or len(self.year_cube[0]) < 2:
+            raise ValueError(f"View pertumbuhan butuh data minimal 2 tahun (tersedia: {self.tahun_list or 'tidak ada'})")
+        years, kecamatan, bidang, totals = self.year_cube
+        names = kecamatan if axis == 1 else bidang
+        label = names.name
         
-        # 5. Statistics summary
-        analysis['statistik'] = {
-            'total_umkm': int(self.processed_data['Total'].sum()),
-            'total_mikro': int(self.processed_data['Mikro'].sum()),
-            'total_kecil': int(self.processed_data['Kecil'].sum()),
-            'jumlah_kecamatan': self.processed_data['Kecamatan'].nunique(),
-            'jumlah_bidang': self.processed_data['Bidang'].nunique(),
-            'rata_rata_per_kecamatan': float(self.processed_data.groupby('Kecamatan')['Total'].sum().mean()),
-            'rata_rata_per_bidang': float(self.processed_data.groupby('Bidang')['Total'].sum().mean())
-        }
+        # (tahun, category) totals; every year-over-year figure is one array op
+        per_year = totals.sum(axis=3 - axis)
+        consecutive = np.zeros(len(years), dtype=bool)
+        consecutive[1:] = np.diff(years) == 1
+        delta = np.full(per_year.shape, np.nan)
+        delta[1:] = np.diff(per_year, axis=0)
+        delta[~consecutive] = np.nan
+        previous = np.full(per_year.shape, np.nan)
+        previous[1:] = per_year[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(previous > 0, delta / previous * 100, np.nan)
+        previous_year = pd.array([years[i - 1] if consecutive[i] else None for i in range(len(years))], dtype='Int64')
+        
+        n_years, n_names = per_year.shape
+        yoy = pd.DataFrame({
+            'Tahun': np.repeat(years, n_names),
+            'Tahun_Sebelumnya': np.repeat(previous_year, n_names),
+            label: np.tile(np.asarray(names), n_years),
+            'Total': per_year.ravel(),
+            'Delta_YoY': delta.ravel(),
+            'Pertumbuhan_YoY_Persen': pct.ravel()
+        })
         
-        return analysis
+        first, last = per_year[0], per_year[-1]
+        span = years[-1] - years[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cagr = np.where((first > 0) & (span > 0), (np.power(last / first, 1 / max(span, 1)) - 1) * 100, np.nan)
+        cagr = pd.DataFrame({
+            label: names,
+            'Tahun_Awal': years[0],
+            'Tahun_Akhir': years[-1],
+            'Total_Awal': first,
+            'Total_Akhir': last,
+            'CAGR_Persen': cagr
+        }).sort_values('CAGR_Persen', ascending=False)
+        
+        return yoy, cagr
+    
+    def _build_pertumbuhan_kecamatan(self):
+        """Year-over-year change per Kecamatan"""
+        return self._growth_frames(axis=1)[0]
+    
+    def _build_pertumbuhan_bidang(self):
+        """Year-over-year change per Bidang"""
+        return self._growth_frames(axis=2)[0]
+    
+    def _build_cagr_kecamatan(self):
+        """Compound annual growth per Kecamatan between first and last year"""
+        return self._growth_frames(axis=1)[1]
+    
+    def _build_cagr_bidang(self):
+        """Compound annual growth per Bidang between first and last year"""
+        return self._growth_frames(axis=2)[1]
     
-    def save_excel_analysis(self, filename='UMKM_Tangerang_Selatan_Analisis.xlsx'):
-        """Save comprehensive Excel analysis"""
+    @instrumented('save_excel_analysis', rows=_processed_rows)
+    def save_excel_analysis(self, filename='UMKM_Tangerang_Selatan_Analisis.xlsx', streaming=False, number_format=None):
+        """Save comprehensive Excel analysis
+        
+        ``streaming=True`` writes through a write-only openpyxl workbook, row
+        by row, so memory stays flat even for a million-row Data_Lengkap.
+        ``number_format`` (e.g. ``'#,##0'``) formats numeric columns in that
+        mode.
+        """
         analysis = self.create_analysis_views()
         
         if not analysis:
@@ -156,6 +892,20 @@ class UMKMDataProcessor:
             
         excel_path = self.output_folder / filename
         
+        if streaming:
+            sheets = [
+                ('Data_Lengkap', self.processed_data),
+                ('Per_Kecamatan_Bidang', analysis['pivot_kecamatan_bidang'].reset_index()),
+                ('Ringkasan_Kecamatan', analysis['ringkasan_kecamatan']),
+                ('Ringkasan_Bidang', analysis['ringkasan_bidang']),
+                ('Top_10_Kombinasi', analysis['top_kombinasi'])
+            ]
+            self.excel_timings = write_excel_streaming(excel_path, sheets, number_format=number_format)
+            for sheet_name, seconds in self.excel_timings.items():
+                print(f"⏱️  {sheet_name:<22} {seconds:.2f} dtk")
+            print(f"✅ File Excel berhasil dibuat: '{excel_path}'")
+            return True
+        
         with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
             # Sheet 1: Raw data
             self.processed_data.to_excel(writer, sheet_name='Data_Lengkap', index=False)
@@ -175,6 +925,7 @@ class UMKMDataProcessor:
         print(f"✅ File Excel berhasil dibuat: '{excel_path}'")
         return True
     
+    @instrumented('save_json_data', rows=_processed_rows)
     def save_json_data(self, filename='umkm_data.json'):
         """Save processed data as JSON for dashboard"""
         analysis = self.create_analysis_views()
@@ -190,28 +941,82 @@ class UMKMDataProcessor:
             'top_kombinasi': analysis['top_kombinasi'].to_dict('records'),
             'statistik': analysis['statistik'],
             'pivot_data': analysis['pivot_kecamatan_bidang'].to_dict('index'),
-            'metadata': {
-                'last_updated': datetime.now().isoformat(),
-                'total_records': len(self.processed_data),
-                'kecamatan_list': self.kecamatan_list
-            }
+            'metadata': self._metadata()
         }
         
+        # Growth views only make sense with more than one year
+        if len(self.tahun_list) > 1:
+            json_data['pertumbuhan'] = {
+                name: _records(self.get_view(name)) for name in self.GROWTH_VIEW_NAMES
+            }
+        
+        # Write then rename so a running dashboard never reads a half-written file
         json_path = self.output_folder / filename
-        with open(json_path, 'w', encoding='utf-8') as f:
+        tmp_path = json_path.with_name(json_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(json_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, json_path)
             
         print(f"✅ File JSON berhasil dibuat: '{json_path}'")
         return True
     
+    @instrumented('save_columnar_data', rows=_processed_rows)
+    def save_columnar_data(self, filename='umkm_data.columnar.json', compress=True):
+        """Save a compact columnar variant of the dashboard JSON
+        
+        Tables are stored as one array per column with Kecamatan/Bidang
+        dictionary-encoded; ``compress`` gzips the file (``.gz`` suffix).
+        Both dashboards load it directly via ``umkm_payload.load_payload``.
+        """
+        analysis = self.create_analysis_views()
+        
+        if not analysis:
+            return False
+        
+        tables = {
+            'data_lengkap': self.processed_data,
+            'ringkasan_kecamatan': analysis['ringkasan_kecamatan'],
+            'ringkasan_bidang': analysis['ringkasan_bidang'],
+            'top_kombinasi': analysis['top_kombinasi']
+        }
+        growth = None
+        if len(self.tahun_list) > 1:
+            growth = {name: self.get_view(name) for name in self.GROWTH_VIEW_NAMES}
+        payload = build_payload(
+            tables,
+            analysis['pivot_kecamatan_bidang'],
+            analysis['statistik'],
+            self._metadata(),
+            extra_tables=growth
+        )
+        
+        if compress and not filename.endswith('.gz'):
+            filename += '.gz'
+        columnar_path = self.output_folder / filename
+        size = write_payload(payload, columnar_path, compress=compress)
+        
+        print(f"✅ File JSON kolumnar berhasil dibuat: '{columnar_path}' ({size / 1024:,.1f} KB)")
+        return True
+    
+    def _metadata(self):
+        """Metadata block shared by the JSON outputs"""
+        return {
+            'last_updated': datetime.now().isoformat(),
+            'total_records': len(self.processed_data),
+            'kecamatan_list': self.kecamatan_list,
+            'tahun': self.tahun,
+            'tahun_list': self.tahun_list,
+            'tahun_bidang': self.tahun_bidang
+        }
+    
+    @instrumented('print_summary')
     def print_summary(self):
         """Print comprehensive analysis summary"""
         if self.processed_data is None:
             print("❌ Data belum diproses")
             return
             
-        analysis = self.create_analysis_views()
-        stats = analysis['statistik']
+        stats = self.get_view('statistik')
         
         print("\n📈 RINGKASAN ANALISIS UMKM TANGERANG SELATAN")
         print("=" * 50)
@@ -224,12 +1029,12 @@ class UMKMDataProcessor:
         print(f"📊 Rata-rata per Bidang: {stats['rata_rata_per_bidang']:.1f}")
         
         print("\n🏆 TOP 3 KECAMATAN (berdasarkan jumlah UMKM):")
-        top_kecamatan = analysis['ringkasan_kecamatan'].head(3)
+        top_kecamatan = self.get_view('ringkasan_kecamatan').head(3)
         for i, row in top_kecamatan.iterrows():
             print(f"   {row['Kecamatan']:<15}: {row['Total']:,} UMKM")
         
         print("\n🏆 TOP 3 BIDANG USAHA (berdasarkan jumlah UMKM):")
-        top_bidang = analysis['ringkasan_bidang'].head(3)
+        top_bidang = self.get_view('ringkasan_bidang').head(3)
         for i, row in top_bidang.iterrows():
             print(f"   {row['Bidang']:<15}: {row['Total']:,} UMKM")
         
@@ -245,6 +1050,7 @@ def main():
             # Save outputs
             processor.save_excel_analysis()
             processor.save_json_data()
+            processor.save_columnar_data()
             processor.print_summary()
         else:
             print("❌ Gagal memproses data")
@@ -0,0 +1,145 @@
+"""
+📦 UMKM Payload - Compact Columnar Dashboard Data
+Writes and reads the columnar (optionally gzipped) variant of umkm_data.json
+"""
+
+import gzip
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+FORMAT_NAME = 'umkm-columnar'
+FORMAT_VERSION = 1
+
+# Repeated string columns stored as integer codes into a shared dictionary
+DICTIONARY_COLUMNS = ('Kecamatan', 'Bidang')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+def _column_values(series):
+    """Plain list for a column, with NaN turned into null"""
+    if series.isna().any():
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+def encode_frame(df, dictionaries):
+    """Encode a DataFrame as {length, columns: {name: [...]}}
+
+    Columns listed in DICTIONARY_COLUMNS are written as codes into
+    ``dictionaries``, which is extended in place with unseen values.
+    """
+    columns = {}
+    for column in df.columns:
+        if column in DICTIONARY_COLUMNS:
+            values = dictionaries.setdefault(column, [])
+            unseen = df[column][~df[column].isin(values)].unique()
+            values.extend(unseen.tolist())
+            columns[column] = pd.Index(values).get_indexer(df[column]).tolist()
+        else:
+            columns[column] = _column_values(df[column])
+
+    return {'length': len(df), 'columns': columns}
+
+def decode_frame(table, dictionaries):
+    """Inverse of encode_frame"""
+    columns = {}
+    for column, values in table['columns'].items():
+        if column in DICTIONARY_COLUMNS:
+            dictionary = np.asarray(dictionaries[column], dtype=object)
+            columns[column] = dictionary[np.asarray(values, dtype=np.int64)]
+        else:
+            columns[column] = values
+
+    return pd.DataFrame(columns, index=pd.RangeIndex(table['length']))
+
+def encode_pivot(pivot):
+    """Encode a pivot table as index/columns/values arrays"""
+    return {
+        'index': pivot.index.tolist(),
+        'columns': pivot.columns.tolist(),
+        'values': pivot.to_numpy().tolist()
+    }
+
+def decode_pivot(pivot):
+    """Inverse of encode_pivot
+
+    Also accepts the {kecamatan: {bidang: count}} mapping written by older
+    versions of umkm_data.json.
+    """
+    if 'values' not in pivot:
+        frame = pd.DataFrame.from_dict(pivot, orient='index')
+        frame.index.name, frame.columns.name = 'Kecamatan', 'Bidang'
+        return frame
+    return pd.DataFrame(
+        pivot['values'],
+        index=pd.Index(pivot['index'], name='Kecamatan'),
+        columns=pd.Index(pivot['columns'], name='Bidang')
+    )
+
+def build_payload(tables, pivot, statistik, metadata, extra_tables=None):
+    """Assemble the columnar payload from DataFrames and plain dicts"""
+    dictionaries = {}
+    payload = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'dictionaries': dictionaries,
+        'tables': {name: encode_frame(df, dictionaries) for name, df in tables.items()},
+        'pivot_data': encode_pivot(pivot),
+        'statistik': statistik,
+        'metadata': metadata
+    }
+    if extra_tables:
+        payload['pertumbuhan'] = {
+            name: encode_frame(df, dictionaries) for name, df in extra_tables.items()
+        }
+    return payload
+
+def write_payload(payload, path, compress=True):
+    """Write a payload as compact JSON, gzipped if ``compress``"""
+    raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if compress:
+        raw = gzip.compress(raw, compresslevel=6, mtime=0)
+
+    # Write then rename so readers never see a partial file
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(raw)
+    os.replace(tmp_path, path)
+    return len(raw)
+
+def load_payload(path):
+    """Load dashboard data from umkm_data.json or its columnar variant
+
+    The format is detected from the content (gzip magic bytes and the
+    ``format`` marker). For columnar files the tables are returned as
+    DataFrames under the same keys as umkm_data.json, so callers can keep
+    using ``pd.DataFrame(data['data_lengkap'])``. ``pivot_data`` is a
+    Kecamatan x Bidang DataFrame in both formats.
+    """
+    with open(Path(path), 'rb') as f:
+        return parse_payload(f.read())
+
+def parse_payload(raw):
+    """load_payload for file content already read into memory"""
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    data = json.loads(raw.decode('utf-8'))
+
+    if data.get('format') != FORMAT_NAME:
+        if 'pivot_data' in data:
+            data['pivot_data'] = decode_pivot(data['pivot_data'])
+        return data
+
+    dictionaries = data['dictionaries']
+    decoded = {name: decode_frame(table, dictionaries) for name, table in data['tables'].items()}
+    decoded['pivot_data'] = decode_pivot(data['pivot_data'])
+    decoded['statistik'] = data['statistik']
+    decoded['metadata'] = data['metadata']
+    if 'pertumbuhan' in data:
+        decoded['pertumbuhan'] = {
+            name: decode_frame(table, dictionaries) for name, table in data['pertumbuhan'].items()
+        }
+    return decoded
@@ -0,0 +1,17 @@
+"""
+🌐 WSGI Entry Point - Production Serving
+Loads the dashboard once so gunicorn can preload it before forking workers:
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+"""
+
+import os
+from dashboard_umkm import UMKMDashboard
+
+DATA_PATH = os.environ.get('UMKM_DATA_PATH', 'data_output/umkm_data.json')
+
+dashboard = UMKMDashboard(data_path=DATA_PATH)
+dashboard.warm_up()
+
+# The Flask app gunicorn serves
+server = dashboard.server